@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Sahte sağlayıcı (bist_scanner.fake) ile aşama bazında süre ölçümü.
+# Her evren boyutu ayrı bir süreçte, boş bir veri dizininde çalışır; sonuçlar
+# karşılaştırma için benchmarks/results.jsonl dosyasına satır satır eklenir.
+#
+#   python benchmarks/bench.py --sizes 50,500,5000 --latency 0.05
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results.jsonl")
+
+def timed(stages, name, func, calls=1):
+    started = time.perf_counter()
+    value = func()
+    elapsed = time.perf_counter() - started
+    stages[name] = {'total_s': round(elapsed, 4), 'calls': calls,
+                    'per_call_ms': round(elapsed / max(calls, 1) * 1000, 4)}
+    return value
+
+def run_child(size, latency, bars, workers):
+    sys.path.insert(0, ROOT)
+    from bist_scanner import BIST_50
+    from bist_scanner.bars import load_price_panel
+    from bist_scanner.fake import FakeProvider
+    from bist_scanner.fundamentals import fetch_info, get_fundamental_data, get_fundamentals_store
+    from bist_scanner.indicators import calculate_indicators, calculate_panel_indicators
+    from bist_scanner.provider import set_provider
+    from bist_scanner.scan import run_scan
+    from bist_scanner.scoring import analyze_with_news, calculate_quality_score, categorize_results
+    from bist_scanner.sentiment import analyze_headlines, analyze_sentiment
+    
+    provider = FakeProvider(latency=latency, bars=bars)
+    set_provider(provider)
+    tickers = BIST_50 if size == len(BIST_50) else [f"SYN{i:04d}.IS" for i in range(size)]
+    stages = {}
+    
+    # Soğuk tam tarama: bar indirme + depo yazımı + temel + haber + puanlama
+    results = timed(stages, 'full_scan', lambda: run_scan(tickers, max_workers=workers), size)
+    timed(stages, 'categorize_results', lambda: categorize_results(results), len(results))
+    
+    # Aşama bazında ölçümler (depolar artık sıcak)
+    panel = timed(stages, 'load_price_panel', lambda: load_price_panel(tickers))
+    frames = [panel.xs(t, level='Ticker') for t in tickers]
+    timed(stages, 'calculate_indicators', lambda: [calculate_indicators(f) for f in frames], len(frames))
+    indicators = timed(stages, 'calculate_panel_indicators', lambda: calculate_panel_indicators(panel))
+    
+    titles = [item['title'] for t in tickers for item in FakeProvider(bars=bars).news(t)]
+    analyze_sentiment.cache_clear()
+    timed(stages, 'analyze_sentiment_cold', lambda: analyze_headlines(titles), len(titles))
+    timed(stages, 'analyze_sentiment_warm', lambda: analyze_headlines(titles), len(titles))
+    
+    get_fundamentals_store().clear()
+    fetch_info.clear()
+    timed(stages, 'get_fundamental_data', lambda: [get_fundamental_data(t) for t in tickers], size)
+    timed(stages, 'get_fundamental_data_warm', lambda: [get_fundamental_data(t) for t in tickers], size)
+    
+    analyze_with_news.clear()  # girdisi değişmeyen hisse puanlanmadan dönerdi
+    analyzed = timed(stages, 'analyze_with_news', lambda: [analyze_with_news(t, panel, indicators) for t in tickers], size)
+    pairs = [(r, c['type']) for r in analyzed if r for c in r['categories']]
+    timed(stages, 'calculate_quality_score', lambda: [calculate_quality_score(r, c) for r, c in pairs], len(pairs))
+    return stages
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="bist_scanner benchmark")
+    parser.add_argument("--sizes", default="50,500,5000", help="virgülle ayrılmış evren boyutları")
+    parser.add_argument("--latency", type=float, default=0.0, help="sahte sağlayıcı istek gecikmesi (sn)")
+    parser.add_argument("--bars", type=int, default=250, help="hisse başına günlük bar")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(run_child(args.child, args.latency, args.bars, args.workers)))
+        return
+    
+    commit = git_commit()
+    for size in [int(s) for s in args.sizes.split(',')]:
+        with tempfile.TemporaryDirectory() as data_dir:
+            env = dict(os.environ, BIST_DATA_DIR=data_dir)
+            out = subprocess.run([sys.executable, __file__, "--child", str(size), "--latency", str(args.latency),
+                                  "--bars", str(args.bars), "--workers", str(args.workers)],
+                                 env=env, capture_output=True, text=True, check=True)
+        stages = json.loads(out.stdout.strip().splitlines()[-1])
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+            'python': platform.python_version(), 'size': size, 'latency': args.latency,
+            'bars': args.bars, 'workers': args.workers, 'stages': stages,
+        }
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"{size:>5} hisse: " + ", ".join(f"{k}={v['total_s']:.3f}s" for k, v in stages.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# Streamlit'ten bağımsız tarama kütüphanesi. Alt modüller (ve pandas/numpy/yfinance)
+# yalnızca ilgili isim ilk kullanıldığında yüklenir.
+import importlib
+
+_EXPORTS = {
+    'BIST_50': 'config',
+    'get_stock_news': 'news',
+    'get_market_sentiment': 'news',
+    'SentimentAggregator': 'news',
+    'get_fundamental_data': 'fundamentals',
+    'load_price_panel': 'bars',
+    'get_price_history': 'bars',
+    'calculate_indicators': 'indicators',
+    'calculate_panel_indicators': 'indicators',
+    'IndicatorState': 'indicators',
+    'analyze_sentiment': 'sentiment',
+    'analyze_headlines': 'sentiment',
+    'analyze_with_news': 'scoring',
+    'calculate_quality_score': 'scoring',
+    'categorize_results': 'scoring',
+    'results_table': 'scoring',
+    'scan_universe': 'scan',
+    'run_scan': 'scan',
+    'write_snapshot': 'snapshot',
+    'load_latest_snapshot': 'snapshot',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'bist_scanner' has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
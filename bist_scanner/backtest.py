@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from .bars import get_bar_store
+from .indicators import calculate_panel_indicators
+from .scoring import HORIZONS, category_targets, fundamental_score, signal_masks, technical_scores
+
+# analyze_with_news kurallarının geçmiş günlük barlar üzerinde testi. Tüm tarih x hisse
+# matrisi tek seferde değerlendirilir; gün bazında döngü yoktur. Geçmiş haber olmadığı
+# için haber etkisi 0 alınır; aylık kural yalnızca temel veri verilirse tetiklenebilir.
+
+MIN_BARS = 30  # canlı taramadaki "en az 30 bar" koşulu
+EMPTY_STORE = "Yerel bar deposunda bu hisseler için veri yok; önce bir tarama yapın (python -m bist_scanner scan)."
+
+def fundamental_arrays(fundamentals, tickers):
+    # {ticker: {'price_to_book', 'roe', 'profit_margin'}} -> hisse başına sabit diziler
+    fields = ['price_to_book', 'roe', 'profit_margin']
+    return {f: np.array([(fundamentals.get(t) or {}).get(f, np.nan) for t in tickers], dtype=float)
+            for f in fields}
+
+def run_backtest(tickers, panel=None, fundamentals=None):
+    # Barlar yalnızca yerel depodan okunur (ağ erişimi yok)
+    panel = get_bar_store().panel(tickers) if panel is None else panel
+    if not len(panel):
+        raise ValueError(EMPTY_STORE)
+    ind = calculate_panel_indicators(panel)
+    tech = ind.values
+    close = tech['current_price']
+    high = panel['High'].unstack(level='Ticker').reindex(index=ind.dates, columns=ind.tickers)
+    low = panel['Low'].unstack(level='Ticker').reindex(index=ind.dates, columns=ind.tickers)
+    close_frame = ind.frame('current_price')
+    
+    ready = np.cumsum(~np.isnan(close), axis=0) >= MIN_BARS
+    day_score, week_score = technical_scores(tech)
+    if fundamentals:
+        month_score = np.broadcast_to(fundamental_score(fundamental_arrays(fundamentals, ind.tickers)), close.shape)
+    else:
+        month_score = np.zeros(close.shape)
+    masks = signal_masks(day_score, week_score, month_score, tech['rsi'])
+    targets = category_targets(close, tech['atr'])
+    
+    rows = []
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for (cat_type, action), mask in masks.items():
+            horizon = HORIZONS[cat_type]
+            # t+1..t+horizon penceresi: pencere sonu t+horizon'daki rolling değeri geri kaydırılır
+            future_high = high.rolling(horizon).max().shift(-horizon).to_numpy()
+            future_low = low.rolling(horizon).min().shift(-horizon).to_numpy()
+            future_close = close_frame.shift(-horizon).to_numpy()
+            target = targets[cat_type, action]
+            if action == 'AL':
+                hit = future_high >= target
+                ret = future_close / close - 1
+                drawdown = np.minimum(future_low / close - 1, 0)
+            else:
+                hit = future_low <= target
+                ret = 1 - future_close / close
+                drawdown = np.minimum(1 - future_high / close, 0)
+            selected = mask & ready & ~np.isnan(future_close)
+            n = int(selected.sum())
+            rows.append({
+                'category': cat_type, 'action': action, 'horizon': horizon, 'signals': n,
+                'tickers': int(selected.any(axis=0).sum()),
+                'hit_rate': hit[selected].mean() * 100 if n else np.nan,
+                'avg_return': ret[selected].mean() * 100 if n else np.nan,
+                'avg_drawdown': drawdown[selected].mean() * 100 if n else np.nan,
+                'max_drawdown': drawdown[selected].min() * 100 if n else np.nan,
+            })
+    report = pd.DataFrame(rows)
+    report.attrs['start'] = ind.dates[0] if len(ind.dates) else None
+    report.attrs['end'] = ind.dates[-1] if len(ind.dates) else None
+    return report
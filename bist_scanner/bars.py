@@ -0,0 +1,176 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: yalnızca süreç içi kilit
+    fcntl = None
+
+from .config import BAR_ADJUST_TOLERANCE, BAR_LOOKBACK, DATA_DIR
+from .metrics import METRICS
+from .provider import get_provider
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+def empty_panel():
+    return pd.DataFrame(columns=PRICE_COLUMNS,
+                        index=pd.MultiIndex.from_arrays([[], []], names=['Ticker', 'Date']))
+
+def download_bars(tickers, interval="1d", **span):
+    # Çoklu hisse isteği; (ticker, tarih) indeksli uzun tablo döner
+    key = f"{tickers[0]}..({len(tickers)})"
+    METRICS.attempt('history', key)
+    try:
+        with METRICS.timer('history'):
+            raw = get_provider().download(tickers, interval=interval, **span)
+        METRICS.success('history', key)
+    except Exception as e:
+        METRICS.failure('history', key, e)
+        return empty_panel()
+    return stack_download(raw, tickers)
+
+def stack_download(raw, tickers):
+    # yf.download biçimi (ticker, alan) sütunlu geniş tablo -> (ticker, tarih) indeksli uzun tablo
+    if raw is None or raw.empty:
+        return empty_panel()
+    if not isinstance(raw.columns, pd.MultiIndex):
+        raw.columns = pd.MultiIndex.from_product([list(tickers), raw.columns])
+    long = raw.stack(level=0, future_stack=True)
+    long.index = long.index.set_names(['Date', 'Ticker'])
+    return long.swaplevel().dropna(subset=['Close'])[PRICE_COLUMNS].sort_index()
+
+class BarStore:
+    # Hisse başına parquet dosyası; her taramada yalnızca son kayıttan sonraki barlar iner.
+    # Aynı depoya sayfa, işçi ve gün içi parçaları birlikte yazar: hisse başına kilit (thread +
+    # dosya kilidi) ve her yazıcıya ayrı geçici dosya.
+    def __init__(self, root, interval="1d", lookback=BAR_LOOKBACK, keep_in_memory=False):
+        self.root = os.path.join(root, interval)
+        self.interval = interval
+        self.lookback = lookback
+        # Sık yenilenen (gün içi) depolarda okunan tablolar bellekte tutulur; dosya
+        # değişmişse (mtime) yeniden okunur
+        self.frames = {} if keep_in_memory else None
+        self.locks = {}
+        self.guard = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, ticker):
+        return os.path.join(self.root, f"{ticker}.parquet")
+
+    def load(self, ticker):
+        path = self.path(ticker)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if self.frames is None:
+            return pd.read_parquet(path)
+        hit = self.frames.get(ticker)
+        if hit is None or hit[0] != mtime:
+            hit = self.frames[ticker] = (mtime, pd.read_parquet(path))
+        return hit[1]
+
+    @contextmanager
+    def lock(self, ticker):
+        with self.guard:
+            lock = self.locks.setdefault(ticker, threading.Lock())
+        with lock, open(self.path(ticker) + ".lock", "a") as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX)  # dosya kapanınca bırakılır
+            yield
+
+    def anchor(self, ticker):
+        # Yeniden çekilecek ilk bar: sondan bir önceki (kapanmış) bar. Son bar seans içinde
+        # kaydedilmişse henüz kapanmamış olabilir; o da yeniden çekilir.
+        data = self.load(ticker)
+        if data is None or not len(data):
+            return None
+        return data.index[-2] if len(data) > 1 else data.index[-1]
+
+    def update(self, tickers, chunk_size=25):
+        # Aynı başlangıç tarihine (gün içi aralıklarda zamanına) sahip hisseler birlikte indirilir.
+        # Kapanmış barın düzeltilmiş fiyatı değiştiyse (temettü, bedelsiz) o hissenin geçmişi
+        # yeni düzeltmeyle baştan indirilir; eski barlarla birleştirilmez.
+        groups = {}
+        for ticker in tickers:
+            start = self.anchor(ticker)
+            if start is not None and self.interval == "1d":
+                start = start.strftime('%Y-%m-%d')
+            groups.setdefault(start, []).append(ticker)
+        readjust = []
+        for start, group in groups.items():
+            span = {'start': start} if start is not None else {'period': self.lookback}
+            for i in range(0, len(group), chunk_size):
+                fresh = download_bars(group[i:i + chunk_size], self.interval, **span)
+                for ticker in fresh.index.unique(level='Ticker'):
+                    if not self.append(ticker, fresh.xs(ticker, level='Ticker')):
+                        readjust.append(ticker)
+        if readjust:
+            METRICS.count('readjusted', 'bars', len(readjust))
+            for i in range(0, len(readjust), chunk_size):
+                fresh = download_bars(readjust[i:i + chunk_size], self.interval, period=self.lookback)
+                for ticker in fresh.index.unique(level='Ticker'):
+                    self.append(ticker, fresh.xs(ticker, level='Ticker'), replace=True)
+
+    def append(self, ticker, bars, replace=False):
+        # Düzeltme farkı görülürse yazmadan False döner
+        with self.lock(ticker):
+            old = None if replace else self.load(ticker)
+            if old is not None:
+                first = bars.index[0]
+                if first in old.index and first != old.index[-1] and not np.isclose(
+                        bars.at[first, 'Close'], old.at[first, 'Close'], rtol=BAR_ADJUST_TOLERANCE, atol=0):
+                    return False
+                if bars.index.isin(old.index).all() and old.loc[bars.index].equals(bars):
+                    return True  # yeniden çekilen barlar değişmemiş: dosya yeniden yazılmaz
+            data = bars if old is None else pd.concat([old, bars])
+            self.write(ticker, data[~data.index.duplicated(keep='last')].sort_index())
+        return True
+
+    def write(self, ticker, data):
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f"{ticker}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            data.to_parquet(tmp)
+            os.replace(tmp, self.path(ticker))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def panel(self, tickers):
+        frames = {t: d for t in tickers if (d := self.load(t)) is not None and len(d)}
+        if not frames:
+            return empty_panel()
+        return pd.concat(frames, names=['Ticker', 'Date'])
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_bar_store():
+    # Günlük bar deposu ilk kullanımda oluşturulur (içe aktarma dizin açmaz)
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BarStore(os.path.join(DATA_DIR, "bars"))
+        return _store
+
+def load_price_panel(tickers):
+    # Önce yerel depo güncellenir (yalnızca eksik barlar), panel diskten okunur
+    store = get_bar_store()
+    store.update(tickers)
+    return store.panel(tickers)
+
+def get_price_history(ticker, panel=None):
+    if panel is not None and ticker in panel.index.get_level_values(0):
+        return panel.xs(ticker, level='Ticker')
+    store = get_bar_store()
+    data = store.load(ticker)
+    if data is None:
+        store.update([ticker])
+        data = store.load(ticker)
+    return data if data is not None else pd.DataFrame(columns=PRICE_COLUMNS)
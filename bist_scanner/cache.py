@@ -0,0 +1,185 @@
+import functools
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .config import CACHE_BACKEND, CACHE_LEASE, CACHE_MAX_BYTES, CACHE_MAX_ENTRIES, DATA_DIR
+from .metrics import METRICS
+
+MISSING = object()
+
+class MemoryBackend:
+    # Süreç içi LRU; eşzamanlı istekler ttl_cache içindeki anahtar kilidiyle birleşir
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            hit = self.entries.get(key)
+            if hit is None:
+                return MISSING
+            if hit[0] < time.time():
+                del self.entries[key]
+                return MISSING
+            self.entries.move_to_end(key)
+            return hit[1]
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (time.time() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def acquire(self, key, lease):
+        return True
+
+    def release(self, key):
+        pass
+
+    def clear(self, prefix=""):
+        with self.lock:
+            for key in [k for k in self.entries if k.startswith(prefix)]:
+                del self.entries[key]
+
+class SqliteBackend:
+    # Süreçler arası paylaşılan önbellek: TTL, erişim zamanına göre LRU boyut sınırı ve
+    # anahtar başına kira (lease) ile tek çekici
+    def __init__(self, path, max_bytes=CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        with self.connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, "
+                       "expires REAL, accessed REAL, size INTEGER)")
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            db.execute("CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT, until REAL)")
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        now = time.time()
+        with self.connect() as db:
+            row = db.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now:
+                return MISSING
+            db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return pickle.loads(row[0])
+
+    def set(self, key, value, ttl):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self.connect() as db:
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                       (key, blob, now + ttl, now, len(blob)))
+            self.evict(db, now)
+
+    def evict(self, db, now):
+        # Önce süresi dolanlar, sonra sınır altına inene kadar en uzun süredir okunmayanlar
+        db.execute("DELETE FROM entries WHERE expires < ?", (now,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        db.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def acquire(self, key, lease):
+        # Kira yoksa ya da süresi dolmuşsa alınır; tek ifade olduğu için atomik
+        now = time.time()
+        with self.connect() as db:
+            cursor = db.execute(
+                "INSERT INTO leases VALUES (?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "owner = excluded.owner, until = excluded.until WHERE leases.until < ?",
+                (key, self.owner, now + lease, now))
+            return cursor.rowcount == 1
+
+    def release(self, key):
+        with self.connect() as db:
+            db.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner))
+
+    def clear(self, prefix=""):
+        with self.connect() as db:
+            db.execute("DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+def create_backend(spec):
+    # "memory", "sqlite" ya da "sqlite:/yol/cache.sqlite"
+    kind, _, path = spec.partition(":")
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "sqlite":
+        return SqliteBackend(path or os.path.join(DATA_DIR, "cache.sqlite"))
+    raise ValueError(f"bilinmeyen önbellek: {spec}")
+
+_backend = None
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = create_backend(CACHE_BACKEND)
+    return _backend
+
+def set_backend(backend):
+    # Önceki arka ucu döner (provider.set_provider gibi)
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
+
+def ttl_cache(ttl, backend=None, lease=CACHE_LEASE):
+    # st.cache_data(ttl=...) yerine: Streamlit'siz önbellek. Arka uç verilmezse BIST_CACHE'ten seçilir.
+    # Aynı anahtar için süreç içinde tek thread, paylaşılan arka uçta tek süreç çeker;
+    # hata önbelleğe yazılmaz, kira bırakılır ve bekleyenlerden biri yeniden dener.
+    def decorator(func):
+        prefix = f"{func.__module__}.{func.__qualname__}"
+        locks = {}
+        guard = threading.Lock()
+
+        def found(value):
+            METRICS.count('cache_hits', func.__name__)
+            return value
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = backend or get_backend()
+            key = prefix + repr((args, sorted(kwargs.items())))
+            value = cache.get(key)
+            if value is not MISSING:
+                return found(value)
+            with guard:
+                lock = locks.setdefault(key, threading.Lock())
+            with lock:
+                value = cache.get(key)
+                if value is not MISSING:
+                    return found(value)
+                while not cache.acquire(key, lease):
+                    time.sleep(0.05)
+                    value = cache.get(key)
+                    if value is not MISSING:
+                        return found(value)
+                try:
+                    value = cache.get(key)
+                    if value is not MISSING:
+                        return found(value)
+                    METRICS.count('cache_misses', func.__name__)
+                    value = func(*args, **kwargs)
+                    cache.set(key, value, ttl)
+                    return value
+                finally:
+                    cache.release(key)
+
+        wrapper.clear = lambda: (backend or get_backend()).clear(prefix)
+        return wrapper
+    return decorator
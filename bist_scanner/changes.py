@@ -0,0 +1,83 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .config import DATA_DIR
+from .scoring import results_table, scan_input_hash
+from .snapshot import json_default, load_latest_snapshot, snapshot_table, table_records, touch_snapshot, write_snapshot
+
+# Ardışık iki snapshot arasındaki sinyal değişiklikleri, (hisse, kategori) anahtarıyla:
+#   new / removed       sinyal çıktı / kalktı
+#   flipped             aynı kategoride işlem yönü değişti (AL <-> SAT)
+#   quality             quality_score değişti
+#   promoted / demoted  TOP/ELITE işareti yükseldi / düştü
+# Değişiklik akışı data/changes.jsonl'e satır başına bir olay olarak eklenir.
+
+CHANGES_FILE = os.path.join(DATA_DIR, "changes.jsonl")
+KEY = ['ticker', 'type']
+BADGE_RANK = {'': 0, 'ELITE': 1, 'TOP': 2}
+EVENT_COLUMNS = ['event', 'ticker', 'type', 'action_before', 'action_after', 'quality_before', 'quality_after',
+                 'badge_before', 'badge_after']
+
+def badges(table):
+    flag = lambda name: table[name].fillna(False).astype(bool).to_numpy()
+    return np.select([flag('is_top'), flag('is_elite')], ['TOP', 'ELITE'], '')
+
+def diff_tables(previous, current):
+    columns = KEY + ['action', 'quality_score', 'is_top', 'is_elite']
+    before = previous.reindex(columns=columns)
+    after = current.reindex(columns=columns)
+    before, after = before.assign(badge=badges(before)), after.assign(badge=badges(after))
+    merged = before.merge(after, on=KEY, how='outer', suffixes=('_before', '_after'), indicator=True)
+    merged = merged.rename(columns={'quality_score_before': 'quality_before', 'quality_score_after': 'quality_after'})
+    quality = ['quality_before', 'quality_after']
+    merged[quality] = merged[quality].astype('Int64')  # dış birleşimde boş kalan taraf NaN'a çevirmesin
+    both = merged['_merge'] == 'both'
+    flipped = both & (merged['action_before'] != merged['action_after'])
+    rank_before, rank_after = merged['badge_before'].map(BADGE_RANK), merged['badge_after'].map(BADGE_RANK)
+    masks = {
+        'new': merged['_merge'] == 'right_only',
+        'removed': merged['_merge'] == 'left_only',
+        'flipped': flipped,
+        'quality': both & ~flipped & (merged['quality_before'] != merged['quality_after']),
+        'promoted': both & (rank_after > rank_before),
+        'demoted': both & (rank_after < rank_before),
+    }
+    events = pd.concat([merged[mask].assign(event=event) for event, mask in masks.items()])
+    return events[EVENT_COLUMNS].sort_values(KEY, kind='stable').reset_index(drop=True)
+
+def append_changes(events, path=CHANGES_FILE):
+    if not events:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False, default=json_default) + "\n")
+
+def load_changes(version=None, path=CHANGES_FILE):
+    # version verilirse yalnızca o snapshot'ı üreten taramanın olayları
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    return [e for e in events if version is None or e['version'] == version]
+
+def publish_scan(tickers, results, path=CHANGES_FILE):
+    # Taramayı snapshot olarak yazar ve bir öncekiyle farkını akışa ekler.
+    # Girdiler (bar, temel veri, haber) bir önceki taramayla aynıysa yeni sürüm yazılmaz:
+    # önceki snapshot'ın checked_at'i güncellenir, o ve None döner.
+    digest = scan_input_hash(tickers, results)
+    previous = load_latest_snapshot()
+    if previous and previous.get('input_hash') == digest:
+        return touch_snapshot(previous), None
+    snapshot = write_snapshot(tickers, results_table(results), digest)
+    if not previous or previous['tickers'] != snapshot['tickers']:
+        return snapshot, []  # farklı evren: karşılaştırma yok, yeni başlangıç
+    header = {'version': snapshot['version'], 'previous_version': previous['version'],
+              'created_at': snapshot['created_at']}
+    events = [{**header, **event}
+              for event in table_records(diff_tables(snapshot_table(previous), snapshot_table(snapshot)))]
+    append_changes(events, path)
+    return snapshot, events
@@ -0,0 +1,201 @@
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+
+from .config import DEFAULT_UNIVERSE, SCAN_WORKERS, SNAPSHOT_INTERVAL, load_universe
+
+# python -m bist_scanner scan|backtest|worker. Ağır modüller komut çalışırken yüklenir;
+# --help ve argüman hataları pandas/yfinance yüklemeden döner.
+
+def log(args, message):
+    if args.verbose:
+        print(message, file=sys.stderr)
+
+def resolve_tickers(args):
+    return args.tickers.split(',') if args.tickers else load_universe(args.universe)
+
+def isolate_data_dir(args):
+    # Kayıt ve tekrar oynatma boş, geçici bir veri dizininde çalışır: yerel depolardaki veriler
+    # taramaya karışmaz, kayıtta her yanıt sağlayıcıdan geçer. Depoları kullanan modüller
+    # bundan sonra yüklenmelidir.
+    import atexit
+    import shutil
+    import tempfile
+    from . import config
+    config.DATA_DIR = tempfile.mkdtemp(prefix="bist_scanner-")
+    atexit.register(shutil.rmtree, config.DATA_DIR, True)
+    log(args, f"geçici veri dizini: {config.DATA_DIR}")
+
+def cmd_scan(args):
+    if args.record or args.replay:
+        isolate_data_dir(args)
+    from .metrics import METRICS
+    from .provider import get_provider, set_provider
+    from .scan import run_scan
+    from .scoring import results_table, split_categories
+    from .snapshot import json_default, table_records
+    
+    tickers = None
+    if args.replay:
+        from .replay import ReplayProvider
+        provider = ReplayProvider(args.replay)
+        set_provider(provider)
+        log(args, f"tekrar oynatma: {args.replay} ({provider.recorded_at:%d.%m.%Y %H:%M:%S} kaydı)")
+        tickers = None if args.tickers else provider.manifest['tickers']
+    elif args.record:
+        from .replay import RecordingProvider
+        set_provider(RecordingProvider(get_provider()))
+    tickers = tickers or resolve_tickers(args)
+    started = time.perf_counter()
+    results = run_scan(tickers, max_workers=args.workers, prefilter=args.prefilter)
+    table = results_table(results)
+    log(args, f"tarama: {len(tickers)} hisse, {time.perf_counter() - started:.2f} sn")
+    if args.record:
+        manifest = get_provider().save(args.record, tickers)
+        log(args, f"kayıt: {args.record} ({manifest['info']} temel, {manifest['news']} haber)")
+    if args.snapshot or args.changes:
+        from .changes import publish_scan
+        with METRICS.timer('publish'):
+            snapshot, events = publish_scan(tickers, results)
+        if events is None:
+            log(args, f"girdiler değişmedi, snapshot: {snapshot['version']}")
+            events = []
+        else:
+            log(args, f"snapshot: {snapshot['version']} ({len(events)} değişiklik)")
+        if args.changes:
+            with open(args.changes, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(e, ensure_ascii=False, default=json_default) + "\n" for e in events)
+    METRICS.write('cli')
+    
+    if args.format == 'json':
+        day, week, month = (table_records(t) for t in split_categories(table))
+        text = json.dumps({'created_at': datetime.now().isoformat(), 'tickers': list(tickers),
+                           'day': day, 'week': week, 'month': month},
+                          ensure_ascii=False, default=json_default, indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(text)
+        else:
+            print(text)
+    elif args.format == 'csv':
+        table.to_csv(args.output or sys.stdout, index=False)
+    elif args.format == 'parquet':
+        if not args.output:
+            raise SystemExit("parquet için --output gerekli")
+        table.to_parquet(args.output, index=False)
+
+def cmd_backtest(args):
+    from .backtest import EMPTY_STORE, run_backtest
+    from .bars import get_bar_store
+    
+    tickers = resolve_tickers(args)
+    panel = get_bar_store().panel(tickers)
+    if not len(panel):
+        raise SystemExit(EMPTY_STORE)
+    fundamentals = None
+    if args.with_fundamentals:
+        from .fundamentals import get_fundamental_data
+        fundamentals = {t: get_fundamental_data(t) for t in tickers}
+    started = time.perf_counter()
+    report = run_backtest(tickers, panel=panel, fundamentals=fundamentals)
+    log(args, f"backtest: {report.attrs['start']} - {report.attrs['end']}, {time.perf_counter() - started:.2f} sn")
+    if args.format == 'csv':
+        report.to_csv(args.output or sys.stdout, index=False)
+    elif args.format == 'json':
+        text = report.to_json(orient='records', force_ascii=False, indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(text)
+        else:
+            print(text)
+    else:
+        print(report.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+def cmd_worker(args):
+    # Streamlit'ten bağımsız arka plan taraması: belirli aralıkla tam hattı çalıştırır,
+    # sonucu data/snapshots altına yazar. Sayfa en son snapshot'ı anında gösterir.
+    # Girdileri değişmeyen tur yeni snapshot yazmaz; değişiklikler data/changes.jsonl'e eklenir.
+    from .changes import publish_scan
+    from .metrics import METRICS
+    from .scan import run_scan
+    from .snapshot import snapshot_table
+    
+    while True:
+        started = time.time()
+        try:
+            tickers = resolve_tickers(args)
+            results = run_scan(tickers, max_workers=args.workers, prefilter=args.prefilter)
+            with METRICS.timer('publish'):
+                snapshot, events = publish_scan(tickers, results)
+            METRICS.write('worker')
+            if events is None:
+                print(f"[{datetime.now():%H:%M:%S}] girdiler değişmedi, snapshot {snapshot['version']} "
+                      f"({time.time() - started:.1f} sn)")
+            else:
+                counts = snapshot_table(snapshot)['type'].value_counts() if snapshot['results'] else {}
+                print(f"[{datetime.now():%H:%M:%S}] snapshot {snapshot['version']}: "
+                      f"{counts.get('GÜN İÇİ', 0)} gün içi, {counts.get('1 HAFTALIK', 0)} haftalık, {counts.get('1 AYLIK', 0)} aylık, "
+                      f"{len(events)} değişiklik ({time.time() - started:.1f} sn)")
+        except Exception as e:
+            print(f"Tarama hatası: {e}")
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="bist_scanner", description="BIST haber + sentiment tarayıcısı")
+    parser.add_argument("-v", "--verbose", action="store_true", help="süre bilgilerini stderr'e yaz")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    universe = argparse.ArgumentParser(add_help=False)
+    universe.add_argument("--universe", default=DEFAULT_UNIVERSE, help="universes/<ad>.txt ya da dosya yolu")
+    universe.add_argument("--tickers", help="virgülle ayrılmış hisse listesi (--universe yerine)")
+    universe.add_argument("--prefilter", action=argparse.BooleanOptionalAction, default=None,
+                          help="ön eleme (varsayılan: büyük evrenlerde açık)")
+    
+    scan = sub.add_parser("scan", parents=[universe], help="tek tarama yapıp sonuçları yaz")
+    scan.add_argument("--format", choices=["json", "csv", "parquet"], default="json")
+    scan.add_argument("--output", "-o", help="çıktı dosyası (varsayılan: stdout)")
+    scan.add_argument("--snapshot", action="store_true", help="sonucu snapshot olarak da kaydet")
+    scan.add_argument("--changes", help="önceki snapshot'a göre değişiklikleri JSON satırları olarak bu dosyaya yaz "
+                                        "(snapshot da kaydedilir)")
+    scan.add_argument("--workers", type=int, default=SCAN_WORKERS)
+    replay = scan.add_mutually_exclusive_group()
+    replay.add_argument("--record", metavar="ARŞİV", help="sağlayıcı yanıtlarını zip arşivine kaydet (soğuk tarama)")
+    replay.add_argument("--replay", metavar="ARŞİV",
+                        help="kayıttan ağsız tekrar oynat (varsayılan hisseler: kayıttakiler)")
+    scan.set_defaults(func=cmd_scan)
+    
+    backtest = sub.add_parser("backtest", help="gün/hafta/ay kurallarını yerel barlar üzerinde test et")
+    backtest.add_argument("--universe", default=DEFAULT_UNIVERSE, help="universes/<ad>.txt ya da dosya yolu")
+    backtest.add_argument("--tickers", help="virgülle ayrılmış hisse listesi (--universe yerine)")
+    backtest.add_argument("--with-fundamentals", action="store_true",
+                          help="aylık kural için güncel temel verileri kullan (geleceğe bakma yanlılığı içerir)")
+    backtest.add_argument("--format", choices=["table", "csv", "json"], default="table")
+    backtest.add_argument("--output", "-o", help="çıktı dosyası (varsayılan: stdout)")
+    backtest.set_defaults(func=cmd_backtest)
+    
+    worker = sub.add_parser("worker", parents=[universe], help="belirli aralıkla tarayıp snapshot yazan arka plan işçisi")
+    worker.add_argument("--interval", type=int, default=SNAPSHOT_INTERVAL, help="taramalar arası saniye")
+    worker.add_argument("--once", action="store_true", help="tek tarama yapıp çık")
+    worker.add_argument("--workers", type=int, default=SCAN_WORKERS)
+    worker.set_defaults(func=cmd_worker)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "scan" and (args.record or args.replay) and (args.snapshot or args.changes):
+        # kayıt/tekrar oynatma geçici veri dizininde çalışır: snapshot ve değişiklikler çıkışta silinir,
+        # gerçek dizine yazılırsa da canlı snapshot akışına kayıttan gelen bir tarama karışır
+        parser.error("--snapshot/--changes, --record/--replay ile birlikte kullanılamaz")
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(levelname)s %(name)s: %(message)s")
+    log(args, f"başlangıç: {(time.perf_counter() - _STARTED) * 1000:.0f} ms")
+    args.func(args)
@@ -0,0 +1,112 @@
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- EVRENLER ---
+# universes/<ad>.txt: satır başına bir hisse, '#' sonrası yorum. BIST 100 / Tüm Hisseler
+# listeleri aynı biçimde bu dizine eklenir.
+UNIVERSE_DIR = os.environ.get("BIST_UNIVERSE_DIR") or os.path.join(ROOT_DIR, "universes")
+DEFAULT_UNIVERSE = "bist50"
+
+def list_universes():
+    if not os.path.isdir(UNIVERSE_DIR):
+        return []
+    return sorted(n[:-4] for n in os.listdir(UNIVERSE_DIR) if n.endswith(".txt"))
+
+def load_universe(name):
+    path = name if os.path.isfile(name) else os.path.join(UNIVERSE_DIR, f"{name}.txt")
+    tickers = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            ticker = line.split('#', 1)[0].strip().upper()
+            if ticker:
+                tickers.append(ticker if '.' in ticker or ticker.startswith('^') else f"{ticker}.IS")
+    return list(dict.fromkeys(tickers))
+
+BIST_50 = load_universe(DEFAULT_UNIVERSE)
+
+# --- SEKTÖRLER ---
+# Piyasa/sektör sentiment'i için BIST 50 gruplaması; listede olmayan hisse "Diğer" sayılır.
+SECTORS = {
+    'AKBNK.IS': "Bankacılık", 'GARAN.IS': "Bankacılık", 'HALKB.IS': "Bankacılık", 'ISCTR.IS': "Bankacılık",
+    'TSKB.IS': "Bankacılık", 'VAKBN.IS': "Bankacılık", 'YKBNK.IS': "Bankacılık",
+    'ALARK.IS': "Holding", 'DOHOL.IS': "Holding", 'KCHOL.IS': "Holding", 'POLHO.IS': "Holding", 'SAHOL.IS': "Holding",
+    'AKSEN.IS': "Enerji", 'ODAS.IS': "Enerji", 'TUPRS.IS': "Enerji", 'ZOREN.IS': "Enerji",
+    'BURCE.IS': "Metal", 'CELHA.IS': "Metal", 'EREGL.IS': "Metal", 'KOZAL.IS': "Metal",
+    'ANACI.IS': "Sanayi", 'KARTN.IS': "Sanayi", 'SISE.IS': "Sanayi", 'TRKCM.IS': "Sanayi",
+    'HEKTS.IS': "Kimya", 'PETKM.IS': "Kimya",
+    'AFYON.IS': "İnşaat ve Çimento", 'ENKAI.IS': "İnşaat ve Çimento", 'NUHCM.IS': "İnşaat ve Çimento",
+    'EKGYO.IS': "GYO", 'ISGYO.IS': "GYO",
+    'ARCLK.IS': "Otomotiv ve Dayanıklı", 'FROTO.IS': "Otomotiv ve Dayanıklı", 'TOASO.IS': "Otomotiv ve Dayanıklı",
+    'TTRAK.IS': "Otomotiv ve Dayanıklı", 'VESBE.IS': "Otomotiv ve Dayanıklı",
+    'BIMAS.IS': "Perakende ve Gıda", 'CADDE.IS': "Perakende ve Gıda", 'DESA.IS': "Perakende ve Gıda",
+    'MAVI.IS': "Perakende ve Gıda", 'MGROS.IS': "Perakende ve Gıda", 'SOKM.IS': "Perakende ve Gıda",
+    'ULKER.IS': "Perakende ve Gıda",
+    'ASELS.IS': "Teknoloji ve İletişim", 'KONTR.IS': "Teknoloji ve İletişim", 'LINK.IS': "Teknoloji ve İletişim",
+    'LOGO.IS': "Teknoloji ve İletişim", 'TCELL.IS': "Teknoloji ve İletişim",
+    'PGSUS.IS': "Ulaştırma", 'THYAO.IS': "Ulaştırma",
+}
+# Piyasa sentiment'inde haber ağırlığı endeks üyeliğiyle çarpılır: BIST 50 dışındaki
+# hisselerin (geniş evrenler) haberleri daha az sayılır.
+MARKET_MEMBER_WEIGHT = 1.0
+MARKET_OTHER_WEIGHT = 0.5
+
+# --- TARAMA AYARLARI ---
+SCAN_WORKERS = 8        # aynı anda analiz edilen hisse sayısı
+YAHOO_MAX_RPS = 4       # Yahoo'ya saniyede en fazla istek
+YAHOO_BURST = 4         # jeton kovası kapasitesi (art arda gidebilecek istek)
+YAHOO_TIMEOUT = 10      # tek isteğin zaman aşımı (sn)
+YAHOO_RETRIES = 3       # geçici hatada (429, 5xx, bağlantı) en fazla yeniden deneme
+YAHOO_BACKOFF = 0.5     # yeniden deneme beklemesi: rastgele [0, min(üst, taban * 2^deneme)]
+YAHOO_BACKOFF_MAX = 8
+YAHOO_BREAKER_FAILURES = 5   # art arda bu kadar geçici hatada devre açılır...
+YAHOO_BREAKER_COOLDOWN = 60  # ...ve bu süre (sn) boyunca istek gönderilmez
+DATA_DIR = os.environ.get("BIST_DATA_DIR") or os.path.join(ROOT_DIR, "data")  # yerel depolar
+BAR_LOOKBACK = "5y"     # ilk indirmede çekilen geçmiş (backtest için yıllar)
+BAR_ADJUST_TOLERANCE = 1e-4  # yeniden çekilen kapanmış barın kapanışı bu orandan fazla değişmişse geçmiş yeniden iner
+NEWS_TTL = 300          # bir hissenin haberleri en fazla bu sıklıkla (sn) yeniden çekilir
+# Temel veriler alan bazında bu süre (sn) boyunca taze sayılır; bayatlayan değer hemen
+# döndürülür ve arka planda yenilenir. Çekilemeyen alan "bilinmiyor" (None) olarak saklanır
+# ve FUNDAMENTAL_RETRY sn sonra yeniden denenir.
+FUNDAMENTAL_TTL = {'price_to_book': 86400, 'roe': 90 * 86400, 'profit_margin': 90 * 86400}
+FUNDAMENTAL_RETRY = 3600
+# Dış çağrı önbelleği: "memory" (süreç içi) ya da "sqlite[:yol]" (süreçler arası paylaşılan).
+# Paylaşılan önbellekte aynı anahtarı yalnızca kirayı (lease) alan süreç çeker, diğerleri bekler.
+CACHE_BACKEND = os.environ.get("BIST_CACHE", "memory")
+CACHE_MAX_ENTRIES = 10000         # memory: LRU üst sınırı
+CACHE_MAX_BYTES = 256 * 1024 ** 2 # sqlite: LRU boyut üst sınırı
+CACHE_LEASE = 30                  # kiranın geçerlilik süresi (sn); çeken süreç ölürse sonra devralınır
+SNAPSHOT_INTERVAL = 900 # arka plan taramasının aralığı (sn)
+SNAPSHOT_KEEP = 48      # diskte tutulan son snapshot sayısı
+# Kademeli tarama: bu sayıdan büyük evrenlerde temel veri ve puanlamadan önce ön eleme
+# yapılır (haber etkisi tam hesaplandığı için kayıpsız)
+PREFILTER_MIN_TICKERS = 50
+# Gün içi canlı mod: dakikalık barlar, zamanlayıcıyla yenilenen sayfa parçası
+INTRADAY_INTERVALS = ["1m", "5m"]
+INTRADAY_INTERVAL = "5m"
+INTRADAY_LOOKBACK = "5d"  # ilk indirme (Yahoo 1m geçmişini 7 günle sınırlar)
+INTRADAY_REFRESH = 60     # yenileme aralığı (sn)
+
+# --- KELİMELER ---
+POSITIVE_WORDS = ['kar', 'büyüme', 'artış', 'yükseliş', 'rekor', 'temettü', 'kazanç', 'güçlü', 'yatırım', 'profit', 'growth', 'success', 'positive']
+NEGATIVE_WORDS = ['zarar', 'düşüş', 'kayıp', 'risk', 'kriz', 'negatif', 'zayıf', 'dava', 'loss', 'decline', 'negative']
+MARKET_IMPACT_WORDS = {'temettü': 3, 'rekor': 3, 'kriz': 3, 'büyüme': 2, 'zarar': 2,
+                       'rekor kar': 4, 'kar uyarısı': 3, 'profit warning': 3}
+# Çok kelimeli ifadeler tek eşleşme sayılır ve içindeki kelimelerin yerine geçer
+POSITIVE_PHRASES = ['rekor kar', 'kar payı', 'bedelsiz sermaye', 'hedef fiyat yükselt', 'record profit']
+NEGATIVE_PHRASES = ['kar uyarısı', 'zarar açıkla', 'hedef fiyat düşür', 'profit warning']
+# Ünsüz yumuşaması: kayıp -> kaybı, kazanç -> kazancı
+STEM_VARIANTS = {'kayıp': ['kayb'], 'kazanç': ['kazanc']}
+SUFFIXES = [
+    'lar', 'ler', 'ı', 'i', 'u', 'ü', 'sı', 'si', 'su', 'sü', 'nı', 'ni', 'nu', 'nü',
+    'ın', 'in', 'un', 'ün', 'nın', 'nin', 'nun', 'nün', 'a', 'e', 'ya', 'ye', 'na', 'ne',
+    'da', 'de', 'ta', 'te', 'nda', 'nde', 'dan', 'den', 'tan', 'ten', 'ndan', 'nden',
+    'la', 'le', 'yla', 'yle', 'lı', 'li', 'lu', 'lü', 'ki', 'dır', 'dir', 'dur', 'dür',
+    'tır', 'tir', 'tur', 'tür', 'yı', 'yi', 'yu', 'yü', 'mız', 'miz', 'muz', 'müz'
+]
+# İngilizce kökler yalnızca İngilizce ek alır (profits, losses); Türkçe köklere uygulanmaz
+ENGLISH_WORDS = ['profit', 'growth', 'success', 'positive', 'loss', 'decline', 'negative',
+                 'record profit', 'profit warning']
+ENGLISH_SUFFIXES = ['s', 'es', 'ed', 'ing']
+# Kısa köke ek zinciri gibi görünen, başka anlamdaki kelimeler (kar + a = "kara para")
+SENTIMENT_EXCEPTIONS = ['kara', 'kare', 'karne', 'karya']
@@ -0,0 +1,111 @@
+import time
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Ağsız, deterministik sağlayıcı: aynı ticker + seed her zaman aynı barları, temel
+# verileri ve haberleri üretir. Benchmark ve çevrimdışı denemeler için.
+
+HEADLINES = [
+    "{name} rekor kâr açıkladı", "{name} temettü dağıtacak", "{name} için hedef fiyat yükseltildi",
+    "{name} zararını açıkladı", "{name} hisselerinde düşüş sürüyor", "{name} yeni yatırım planını duyurdu",
+    "{name} kârında güçlü artış", "{name} hakkında dava açıldı", "{name} genel kurulu toplandı",
+    "{name} ihracatta büyüme hedefliyor",
+]
+WIRE_HEADLINES = [
+    "Borsa İstanbul güne yükselişle başladı", "Piyasalarda kriz endişesi", "BIST 100 endeksi rekor tazeledi",
+]
+
+INTRADAY_FREQ = {'1m': 'min', '2m': '2min', '5m': '5min', '15m': '15min', '30m': '30min', '60m': 'h', '1h': 'h'}
+SESSION = (10, 18)  # BIST seans saatleri
+
+class FakeProvider:
+    def __init__(self, seed=0, latency=0.0, bars=1260, news_per_ticker=10, now=None):
+        self.seed = seed
+        self.latency = latency
+        self.bars = bars
+        self.news_per_ticker = news_per_ticker
+        self.as_of = now or datetime.now().replace(microsecond=0)
+        self.end = pd.Timestamp(self.as_of.date())
+
+    def now(self):
+        return self.as_of
+
+    def _rng(self, ticker, salt):
+        return np.random.default_rng([self.seed, zlib.crc32(f"{ticker}:{salt}".encode())])
+
+    def _sleep(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def history(self, ticker):
+        rng = self._rng(ticker, "bars")
+        dates = pd.bdate_range(end=self.end, periods=self.bars, name='Date')
+        close = 10 + 90 * rng.random() * np.exp(np.cumsum(rng.normal(0.0003, 0.02, self.bars)))
+        spread = np.abs(rng.normal(0, 0.01, self.bars)) * close
+        open_ = close * (1 + rng.normal(0, 0.005, self.bars))
+        return pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) + spread,
+            'Low': np.minimum(open_, close) - spread,
+            'Close': close,
+            'Volume': rng.lognormal(13, 0.6, self.bars).round(),
+        }, index=dates)
+
+    def intraday(self, ticker, interval, sessions=5):
+        # Seans başına ayrı tohum: as_of ilerledikçe eski barlar değişmez, yalnızca yenileri eklenir
+        base = 10 + 90 * self._rng(ticker, "bars").random()
+        frames = []
+        for day in pd.bdate_range(end=self.end, periods=sessions):
+            index = pd.date_range(day + pd.Timedelta(hours=SESSION[0]), day + pd.Timedelta(hours=SESSION[1]),
+                                  freq=INTRADAY_FREQ[interval], inclusive='left', name='Date')
+            rng = self._rng(ticker, f"{interval}:{day.date()}")
+            n = len(index)
+            close = base * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+            spread = np.abs(rng.normal(0, 0.001, n)) * close
+            open_ = close * (1 + rng.normal(0, 0.0005, n))
+            frames.append(pd.DataFrame({
+                'Open': open_,
+                'High': np.maximum(open_, close) + spread,
+                'Low': np.minimum(open_, close) - spread,
+                'Close': close,
+                'Volume': rng.lognormal(9, 0.8, n).round(),
+            }, index=index))
+        data = pd.concat(frames)
+        return data[data.index <= self.as_of]
+
+    def download(self, tickers, interval="1d", **span):
+        self._sleep()
+        frames = {}
+        for ticker in tickers:
+            data = self.intraday(ticker, interval) if interval in INTRADAY_FREQ else self.history(ticker)
+            if span.get('start'):
+                data = data[data.index >= pd.Timestamp(span['start'])]
+            frames[ticker] = data
+        return pd.concat(frames, axis=1)
+
+    def info(self, ticker):
+        self._sleep()
+        rng = self._rng(ticker, "info")
+        return {
+            'priceToBook': float(rng.uniform(0.4, 4.0)),
+            'returnOnEquity': float(rng.uniform(-0.05, 0.45)),
+            'profitMargins': float(rng.uniform(-0.05, 0.30)),
+        }
+
+    def news(self, ticker):
+        self._sleep()
+        rng = self._rng(ticker, "news")
+        name = ticker.split('.')[0]
+        items = []
+        for i in range(self.news_per_ticker):
+            if rng.random() < 0.2:
+                title = WIRE_HEADLINES[rng.integers(len(WIRE_HEADLINES))]
+            else:
+                title = HEADLINES[rng.integers(len(HEADLINES))].format(name=name)
+            published = self.as_of - timedelta(hours=float(rng.uniform(0, 120)))
+            items.append({'title': f"{title} ({i})" if i % 3 else title, 'publisher': 'Sentetik',
+                          'providerPublishTime': int(published.timestamp())})
+        return items
@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import ttl_cache
+from .config import DATA_DIR, FUNDAMENTAL_RETRY, FUNDAMENTAL_TTL
+from .metrics import METRICS, log
+from .provider import get_provider
+
+# alan -> (Yahoo anahtarı, çarpan)
+FIELDS = {
+    'price_to_book': ('priceToBook', 1),
+    'roe': ('returnOnEquity', 100),
+    'profit_margin': ('profitMargins', 100),
+}
+
+def parse_info(info):
+    # Eksik alan 0 değil None ("bilinmiyor") olur
+    values = {}
+    for field, (key, scale) in FIELDS.items():
+        raw = info.get(key)
+        values[field] = None if raw is None else float(raw) * scale
+    return values
+
+class FundamentalsStore:
+    # Alan bazında saklanan temel veriler (SQLite).
+    # value: son bilinen değer (None = bilinmiyor), fetched_at: değerin alındığı an,
+    # checked_at: son deneme (başarısız denemeler eski değeri silmez)
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        with self.connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS fundamentals (ticker TEXT, field TEXT, value REAL, "
+                       "fetched_at REAL, checked_at REAL, PRIMARY KEY (ticker, field))")
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self, ticker):
+        with self.connect() as db:
+            rows = db.execute("SELECT field, value, fetched_at, checked_at FROM fundamentals WHERE ticker = ?",
+                              (ticker,)).fetchall()
+        return {field: (value, fetched_at, checked_at) for field, value, fetched_at, checked_at in rows}
+
+    def due(self, rows, now=None):
+        # Yenilenmesi gereken alanlar: hiç denenmemiş, bilinmiyor ve yeniden deneme vakti gelmiş
+        # ya da değeri kendi TTL'inden eski olanlar
+        now = time.time() if now is None else now
+        due = []
+        for field in FIELDS:
+            if field not in rows:
+                due.append(field)
+                continue
+            value, fetched_at, checked_at = rows[field]
+            if now - checked_at < FUNDAMENTAL_RETRY:
+                continue
+            if value is None or now - fetched_at >= FUNDAMENTAL_TTL[field]:
+                due.append(field)
+        return due
+
+    def save(self, ticker, values, now=None):
+        # Gelen None değerler eski bilinen değerin üzerine yazılmaz; yalnızca deneme zamanı güncellenir
+        now = time.time() if now is None else now
+        with self.lock, self.connect() as db:
+            rows = {field: (value, fetched_at) for field, value, fetched_at in db.execute(
+                "SELECT field, value, fetched_at FROM fundamentals WHERE ticker = ?", (ticker,))}
+            db.executemany("INSERT OR REPLACE INTO fundamentals VALUES (?, ?, ?, ?, ?)", [
+                (ticker, field, value, now, now) if value is not None
+                else (ticker, field, *rows.get(field, (None, None)), now)
+                for field, value in values.items()])
+
+    def clear(self):
+        with self.lock, self.connect() as db:
+            db.execute("DELETE FROM fundamentals")
+
+# Depo ve arka plan havuzu ilk kullanımda oluşturulur: paketi içe aktarmak dosya açmaz,
+# thread başlatmaz
+_store = None
+_refresher = None
+_lazy_lock = threading.Lock()
+_inflight = set()
+_inflight_lock = threading.Lock()
+
+def get_fundamentals_store():
+    global _store
+    with _lazy_lock:
+        if _store is None:
+            _store = FundamentalsStore(os.path.join(DATA_DIR, "fundamentals.sqlite"))
+        return _store
+
+def get_refresher():
+    global _refresher
+    with _lazy_lock:
+        if _refresher is None:
+            _refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fundamentals")
+        return _refresher
+
+@ttl_cache(FUNDAMENTAL_RETRY)
+def fetch_info(ticker):
+    return get_provider().info(ticker)
+
+def refresh_fundamentals(ticker):
+    values = dict.fromkeys(FIELDS)
+    METRICS.attempt('info', ticker)
+    try:
+        with METRICS.timer('info'):
+            values = parse_info(fetch_info(ticker))
+        METRICS.success('info', ticker)
+    except Exception as e:
+        METRICS.failure('info', ticker, e)
+    get_fundamentals_store().save(ticker, values)
+
+def _background_refresh(ticker):
+    try:
+        refresh_fundamentals(ticker)
+    except Exception:
+        log.exception("temel veri yenilenemedi: %s", ticker)
+    finally:
+        with _inflight_lock:
+            _inflight.discard(ticker)
+
+def schedule_refresh(ticker):
+    # Aynı hisse için aynı anda tek arka plan yenilemesi
+    with _inflight_lock:
+        if ticker in _inflight:
+            return False
+        _inflight.add(ticker)
+    get_refresher().submit(_background_refresh, ticker)
+    return True
+
+def get_fundamental_data(ticker):
+    # Depoda değer varsa (bayat olsa bile) hemen döner; bayat alanlar arka planda yenilenir.
+    # Hiç kaydı olmayan hisse ilk seferde eşzamanlı çekilir.
+    store = get_fundamentals_store()
+    rows = store.load(ticker)
+    if not rows:
+        METRICS.count('cache_misses', 'fundamentals_store')
+        refresh_fundamentals(ticker)
+        rows = store.load(ticker)
+    elif store.due(rows):
+        METRICS.count('cache_stale', 'fundamentals_store')
+        schedule_refresh(ticker)
+    else:
+        METRICS.count('cache_hits', 'fundamentals_store')
+    return {field: rows[field][0] if field in rows else None for field in FIELDS}
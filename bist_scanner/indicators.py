@@ -0,0 +1,230 @@
+import copy
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .bars import PRICE_COLUMNS
+
+def indicator_series(close, high, low, volume):
+    # Series (tek hisse) ya da tarih x hisse DataFrame'i için aynı hesap
+    ema_12 = close.ewm(span=12).mean()
+    ema_26 = close.ewm(span=26).mean()
+    macd = ema_12 - ema_26
+    
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14).mean()
+    loss = (-delta).clip(lower=0).rolling(14).mean()
+    rsi = 100 - (100 / (1 + gain / loss))
+    
+    sma = close.rolling(20).mean()
+    std = close.rolling(20).std()
+    
+    avg_vol = volume.rolling(20).mean()
+    vol_ratio = (volume / avg_vol).where(avg_vol > 0, 1.0)
+    
+    prev_close = close.shift(1)
+    tr = np.fmax(high - low, np.fmax((high - prev_close).abs(), (low - prev_close).abs()))
+    
+    return {
+        'ema_9': close.ewm(span=9).mean(), 'ema_21': close.ewm(span=21).mean(),
+        'ema_50': close.ewm(span=50).mean(),
+        'rsi': rsi, 'macd': macd, 'signal': macd.ewm(span=9).mean(),
+        'bb_upper': sma + 2*std, 'bb_lower': sma - 2*std,
+        'volume_ratio': vol_ratio, 'atr': tr.rolling(14).mean(),
+        'current_price': close
+    }
+
+class IndicatorPanel:
+    # Tüm evrenin gösterge serileri: her gösterge için (tarih x hisse) float dizisi
+    def __init__(self, dates, tickers, values):
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.values = values
+        self.column = {t: i for i, t in enumerate(self.tickers)}
+        valid = ~np.isnan(values['current_price'])
+        self.bars = valid.sum(axis=0)
+        self.last_row = np.where(valid.any(axis=0), len(dates) - 1 - np.argmax(valid[::-1], axis=0), -1)
+
+    def __contains__(self, ticker):
+        return ticker in self.column
+
+    def frame(self, name):
+        return pd.DataFrame(self.values[name], index=self.dates, columns=self.tickers)
+
+    def latest(self):
+        # Her hissenin son geçerli barındaki değerler: gösterge -> (hisse,) dizisi
+        cols = np.arange(len(self.tickers))
+        return {name: arr[self.last_row, cols] for name, arr in self.values.items()}
+
+    def snapshot(self, ticker):
+        # calculate_indicators ile aynı sözlük: hissenin son geçerli barındaki değerler
+        col = self.column[ticker]
+        row = self.last_row[col]
+        return {name: arr[row, col] for name, arr in self.values.items()}
+
+def calculate_panel_indicators(panel):
+    # Göstergeler her hissenin kendi barları üzerinde hesaplanır: ortak takvime hizalansa tek
+    # eksik bar (işlem durdurma, yeni halka arz) pencereleri NaN yapardı. Barlar hisse içi
+    # sıra numarasıyla hizalanır (boşluk yalnızca kısa geçmişlerin sonunda kalır), sonuç
+    # tarihlere geri yerleştirilir.
+    panel = panel[panel['Close'].notna()].sort_index()
+    tickers = panel.index.get_level_values('Ticker')
+    dates = panel.index.get_level_values('Date')
+    position = panel.groupby(level='Ticker').cumcount().to_numpy()
+    by_position = pd.MultiIndex.from_arrays([position, tickers], names=['Bar', 'Ticker'])
+    wide = {c: pd.Series(panel[c].to_numpy(), index=by_position).unstack('Ticker')
+            for c in ['Close', 'High', 'Low', 'Volume']}
+    series = indicator_series(wide['Close'], wide['High'], wide['Low'], wide['Volume'])
+    calendar = dates.unique().sort_values()
+    columns = wide['Close'].columns
+    rows, cols = calendar.get_indexer(dates), columns.get_indexer(tickers)
+    values = {}
+    for name, frame in series.items():
+        values[name] = np.full((len(calendar), len(columns)), np.nan)
+        values[name][rows, cols] = frame.to_numpy(dtype=float)[position, cols]
+    return IndicatorPanel(calendar, columns, values)
+
+def calculate_indicators(data):
+    series = indicator_series(data['Close'], data['High'], data['Low'], data['Volume'])
+    return {name: s.iloc[-1] for name, s in series.items()}
+
+class _Ewm:
+    # pandas ewm(span, adjust=True) ile aynı özyineleme, bar başına O(1)
+    def __init__(self, span):
+        self.decay = 1 - 2.0 / (span + 1)
+        self.value = np.nan
+        self.weight = 1.0
+
+    def update(self, x):
+        if self.value != self.value:
+            self.value = x
+        else:
+            self.weight *= self.decay
+            if self.value != x:
+                self.value = (self.weight * self.value + x) / (self.weight + 1.0)
+            self.weight += 1.0
+        return self.value
+
+class _Rolling:
+    # Sabit pencere: çıkan değer düşülür, ortalama/varyans Welford ile güncellenir
+    def __init__(self, size):
+        self.size = size
+        self.window = deque()
+        self.nan_count = 0
+        self.mean_ = 0.0
+        self.ssqdm = 0.0
+        self.last = np.nan
+        self.same_run = 0  # art arda aynı değer sayısı: pandas gibi sabit pencerede tam sonuç
+
+    def _add(self, x):
+        n = len(self.window) - self.nan_count
+        delta = x - self.mean_
+        self.mean_ += delta / n
+        self.ssqdm += delta * (x - self.mean_)
+
+    def _remove(self, x):
+        n = len(self.window) - self.nan_count
+        if n == 0:
+            self.mean_ = self.ssqdm = 0.0
+            return
+        delta = x - self.mean_
+        self.mean_ -= delta / n
+        self.ssqdm -= delta * (x - self.mean_)
+
+    def push(self, x):
+        self.same_run = self.same_run + 1 if x == self.last else 1
+        self.last = x
+        self.window.append(x)
+        if x != x:
+            self.nan_count += 1
+        else:
+            self._add(x)
+        if len(self.window) > self.size:
+            old = self.window.popleft()
+            if old != old:
+                self.nan_count -= 1
+            else:
+                self._remove(old)
+
+    def ready(self):
+        return len(self.window) == self.size and self.nan_count == 0
+
+    def constant(self):
+        return self.same_run >= self.size
+
+    def mean(self):
+        if not self.ready():
+            return np.nan
+        return self.last if self.constant() else self.mean_
+
+    def std(self):
+        if not self.ready():
+            return np.nan
+        return 0.0 if self.constant() else float(np.sqrt(max(self.ssqdm, 0.0) / (self.size - 1)))
+
+class IndicatorState:
+    # Canlı yenileme için hisse başına gösterge durumu; update() yeni barı O(1) işler
+    # ve calculate_indicators ile aynı sözlüğü döner.
+    def __init__(self):
+        self.ema = {span: _Ewm(span) for span in (9, 12, 21, 26, 50)}
+        self.signal = _Ewm(9)
+        self.gain = _Rolling(14)
+        self.loss = _Rolling(14)
+        self.close = _Rolling(20)
+        self.volume = _Rolling(20)
+        self.tr = _Rolling(14)
+        self.prev_close = np.nan
+        self.last_timestamp = None
+        self.values = None
+
+    @classmethod
+    def from_history(cls, data):
+        state = cls()
+        state.feed(data)
+        return state
+
+    def feed(self, data):
+        # Yalnızca son işlenen zamandan sonraki barlar; eklenen bar sayısını döner
+        if self.last_timestamp is not None:
+            data = data[data.index > self.last_timestamp]
+        for ts, bar in zip(data.index, data[PRICE_COLUMNS].itertuples(index=False)):
+            self.update(bar._asdict(), ts)
+        return len(data)
+
+    def peek(self, bar, timestamp=None):
+        # Durumu değiştirmeden: bar eklenseydi göstergeler (seansı süren, kapanmamış bar için)
+        return copy.deepcopy(self).update(bar, timestamp)
+
+    def update(self, bar, timestamp=None):
+        close, high, low, volume = bar['Close'], bar['High'], bar['Low'], bar['Volume']
+        ema = {span: e.update(close) for span, e in self.ema.items()}
+        macd = ema[12] - ema[26]
+        signal = self.signal.update(macd)
+        
+        delta = close - self.prev_close
+        self.gain.push(max(delta, 0.0) if delta == delta else np.nan)
+        self.loss.push(max(-delta, 0.0) if delta == delta else np.nan)
+        gain, loss = self.gain.mean(), self.loss.mean()
+        rs = gain / loss if loss else (np.inf if gain > 0 else np.nan)
+        rsi = 100 - 100 / (1 + rs)
+        
+        self.close.push(close)
+        sma, std = self.close.mean(), self.close.std()
+        
+        self.volume.push(volume)
+        avg_vol = self.volume.mean()
+        
+        tr = np.fmax(high - low, np.fmax(abs(high - self.prev_close), abs(low - self.prev_close)))
+        self.tr.push(tr)
+        self.prev_close = close
+        self.last_timestamp = timestamp
+        
+        self.values = {
+            'ema_9': ema[9], 'ema_21': ema[21], 'ema_50': ema[50],
+            'rsi': rsi, 'macd': macd, 'signal': signal,
+            'bb_upper': sma + 2*std, 'bb_lower': sma - 2*std,
+            'volume_ratio': volume / avg_vol if avg_vol > 0 else 1.0,
+            'atr': self.tr.mean(), 'current_price': close
+        }
+        return self.values
@@ -0,0 +1,63 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .bars import PRICE_COLUMNS, BarStore
+from .config import DATA_DIR, INTRADAY_INTERVAL, INTRADAY_LOOKBACK, SCAN_WORKERS
+from .indicators import IndicatorState
+from .metrics import METRICS
+from .provider import provider_now
+from .scoring import analyze_with_news, results_table
+
+# Gün içi canlı mod: yalnızca GÜN İÇİ kategorisi, dakikalık barlar üzerinden.
+# Hisse başına IndicatorState kapanmış barlarla ilerler; seansı süren son bar peek() ile
+# durumu bozmadan hesaplanır. Son barı değişmeyen hisse yeniden puanlanmaz.
+
+MIN_BARS = 30
+
+class IntradayScanner:
+    def __init__(self, tickers, interval=INTRADAY_INTERVAL, max_workers=SCAN_WORKERS):
+        self.tickers = list(tickers)
+        self.interval = interval
+        self.max_workers = max_workers
+        self.store = BarStore(os.path.join(DATA_DIR, "bars"), interval, INTRADAY_LOOKBACK, keep_in_memory=True)
+        self.states = {}
+        self.signatures = {}  # hisse -> (son bar zamanı, son bar değerleri)
+        self.results = {}
+        self.updated_at = None
+
+    def technical(self, ticker, data):
+        state = self.states.setdefault(ticker, IndicatorState())
+        state.feed(data.iloc[:-1])
+        return state.peek(data.iloc[-1], data.index[-1])
+
+    def analyze(self, ticker, technical):
+        result = analyze_with_news(ticker, technical=technical)
+        if result:
+            # Sonuç puanlama önbelleğiyle paylaşılır; değiştirmeden kopyalanır
+            result = {**result, 'categories': [c for c in result['categories'] if c['type'] == 'GÜN İÇİ']}
+        return result
+
+    def refresh(self):
+        # Yeni barları indirir; verisi değişen hisseleri döner
+        with METRICS.timer('intraday_bars'):
+            self.store.update(self.tickers)
+        changed = {}
+        for ticker in self.tickers:
+            data = self.store.load(ticker)
+            if data is None or len(data) < MIN_BARS:
+                continue
+            signature = (data.index[-1], tuple(data[PRICE_COLUMNS].iloc[-1]))
+            if self.signatures.get(ticker) == signature:
+                continue
+            self.signatures[ticker] = signature
+            changed[ticker] = self.technical(ticker, data)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for ticker, result in zip(changed, pool.map(self.analyze, changed, changed.values())):
+                self.results[ticker] = result
+        METRICS.count('recomputed', 'intraday', len(changed))
+        METRICS.count('unchanged', 'intraday', len(self.tickers) - len(changed))
+        self.updated_at = provider_now()
+        return list(changed)
+
+    def table(self):
+        return results_table([self.results[t] for t in self.tickers if t in self.results])
@@ -0,0 +1,111 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .config import DATA_DIR
+
+# Tarama başına aşama süreleri, sayaçlar (hata, yeniden deneme, önbellek isabeti) ve en
+# yavaş hisseler. run_scan her taramada sıfırlar; çağıran taramayı (ve sayfa çizimini)
+# bitirince Prometheus textfile biçiminde kendi dosyasına yazar ve uygulamadaki tanılama
+# panelinde gösterilir. Uygulama, işçi ve komut satırı ayrı dosyaya yazar; seriler `source`
+# etiketi taşır, aynı dizini okuyan textfile toplayıcısında çakışmaz.
+
+def metrics_file(source):
+    return os.path.join(DATA_DIR, f"metrics_{source}.prom")
+
+log = logging.getLogger("bist_scanner")
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (aşama, anahtar): sonraki deneme "retry" sayılır. Süreç durumudur, reset() ile
+        # silinmez: bir taramada başarısız olan anahtarın sonraki taramadaki denemesi de sayılır.
+        self.failed = set()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.stages = {}       # aşama -> [çağrı, toplam sn, en uzun sn]
+            self.tickers = {}      # hisse -> toplam sn
+            self.counters = {}     # (sayaç, aşama) -> adet
+
+    @contextmanager
+    def timer(self, stage, ticker=None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, ticker)
+
+    def observe(self, stage, seconds, ticker=None):
+        with self.lock:
+            entry = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            if ticker:
+                self.tickers[ticker] = self.tickers.get(ticker, 0.0) + seconds
+
+    def count(self, name, stage, n=1):
+        with self.lock:
+            self.counters[name, stage] = self.counters.get((name, stage), 0) + n
+
+    def attempt(self, stage, key):
+        # Daha önce hata veren bir anahtar tekrar isteniyorsa yeniden deneme sayılır
+        with self.lock:
+            retry = (stage, key) in self.failed
+        if retry:
+            self.count('retries', stage)
+
+    def failure(self, stage, key, error):
+        self.count('errors', stage)
+        with self.lock:
+            self.failed.add((stage, key))
+        log.warning("%s hatası (%s): %s", stage, key, error)
+
+    def success(self, stage, key):
+        with self.lock:
+            self.failed.discard((stage, key))
+
+    def summary(self, slowest=10):
+        with self.lock:
+            return {
+                'started': self.started,
+                'stages': {stage: {'calls': n, 'total_s': total, 'mean_ms': total / n * 1000, 'max_ms': peak * 1000}
+                           for stage, (n, total, peak) in sorted(self.stages.items())},
+                'counters': {f"{name}.{stage}": n for (name, stage), n in sorted(self.counters.items())},
+                'slowest_tickers': sorted(self.tickers.items(), key=lambda kv: kv[1], reverse=True)[:slowest],
+            }
+
+    def prometheus(self, source):
+        summary = self.summary()
+        src = f'source="{source}"'
+        lines = [
+            "# TYPE bist_scanner_stage_seconds_total gauge",
+            *[f'bist_scanner_stage_seconds_total{{{src},stage="{s}"}} {v["total_s"]:.6f}' for s, v in summary['stages'].items()],
+            "# TYPE bist_scanner_stage_calls gauge",
+            *[f'bist_scanner_stage_calls{{{src},stage="{s}"}} {v["calls"]}' for s, v in summary['stages'].items()],
+            "# TYPE bist_scanner_stage_max_seconds gauge",
+            *[f'bist_scanner_stage_max_seconds{{{src},stage="{s}"}} {v["max_ms"] / 1000:.6f}' for s, v in summary['stages'].items()],
+        ]
+        with self.lock:
+            counters = sorted(self.counters.items())
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE bist_scanner_{name} gauge")
+            lines += [f'bist_scanner_{name}{{{src},stage="{stage}"}} {n}' for (c, stage), n in counters if c == name]
+        lines.append("# TYPE bist_scanner_ticker_seconds gauge")
+        lines += [f'bist_scanner_ticker_seconds{{{src},ticker="{t}"}} {s:.6f}' for t, s in summary['slowest_tickers']]
+        lines.append(f"bist_scanner_last_scan_timestamp_seconds{{{src}}} {summary['started']:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, source):
+        path = metrics_file(source)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(self.prometheus(source))
+        os.replace(path + ".tmp", path)
+
+METRICS = Metrics()
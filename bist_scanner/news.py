@@ -0,0 +1,197 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from .cache import ttl_cache
+from .config import BIST_50, DATA_DIR, MARKET_MEMBER_WEIGHT, MARKET_OTHER_WEIGHT, NEWS_TTL, SECTORS
+from .metrics import METRICS
+from .sentiment import analyze_headlines, turkish_lower
+from .provider import get_provider, provider_now
+
+def headline_hash(title, published):
+    # Aynı ajans haberi farklı hisselerde tek kayıt olur. Yayın zamanı da anahtarda: aynı
+    # başlıkla tekrarlanan haber ("rekor kâr açıkladı", günlük bülten) yeni kayıttır.
+    normalized = ' '.join(turkish_lower(title).split())
+    return hashlib.sha1(f"{normalized}|{published:%Y-%m-%dT%H:%M:%S}".encode('utf-8')).hexdigest()[:16]
+
+def parse_news_item(item):
+    # yfinance eski (düz) ve yeni ('content' altında) haber biçimleri
+    content = item.get('content') or item
+    provider = content.get('provider') or {}
+    if item.get('providerPublishTime'):
+        published = datetime.fromtimestamp(item['providerPublishTime'])
+    elif content.get('pubDate'):
+        published = datetime.fromisoformat(content['pubDate'].replace('Z', '+00:00')).astimezone().replace(tzinfo=None)
+    else:
+        published = datetime.fromtimestamp(0)
+    return {
+        'title': content.get('title', ''),
+        'publisher': content.get('publisher') or provider.get('displayName', ''),
+        'published': published
+    }
+
+class NewsStore:
+    # (Başlık, yayın zamanı) hash'ine göre tekilleştirilmiş haber deposu (SQLite); her haber bir kez puanlanır
+    SCHEMA = 1  # hash tanımı değişince eski kayıtlar atılır (yalnızca önbellek)
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        with self.connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA:
+                db.execute("DROP TABLE IF EXISTS headlines")
+                db.execute("DROP TABLE IF EXISTS links")
+                db.execute("DROP TABLE IF EXISTS fetches")
+                db.execute(f"PRAGMA user_version = {self.SCHEMA}")
+            db.execute("CREATE TABLE IF NOT EXISTS headlines (hash TEXT PRIMARY KEY, title TEXT, "
+                       "publisher TEXT, published REAL, score REAL, label TEXT)")
+            db.execute("CREATE TABLE IF NOT EXISTS links (hash TEXT, ticker TEXT, PRIMARY KEY (hash, ticker))")
+            db.execute("CREATE TABLE IF NOT EXISTS fetches (ticker TEXT PRIMARY KEY, fetched_at REAL)")
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def is_fresh(self, ticker, ttl):
+        with self.connect() as db:
+            row = db.execute("SELECT fetched_at FROM fetches WHERE ticker = ?", (ticker,)).fetchone()
+        return row is not None and time.time() - row[0] < ttl
+
+    def ingest(self, ticker, items):
+        # Yalnızca daha önce görülmemiş başlıklar puanlanıp eklenir; hepsi hisseye bağlanır
+        keyed = {headline_hash(item['title'], item['published']): item for item in items if item['title']}
+        with self.lock, self.connect() as db:
+            known = set()
+            hashes = list(keyed)
+            for i in range(0, len(hashes), 500):
+                part = hashes[i:i + 500]
+                known.update(h for (h,) in db.execute(
+                    f"SELECT hash FROM headlines WHERE hash IN ({','.join('?' * len(part))})", part))
+            new = [h for h in hashes if h not in known]
+            with METRICS.timer('sentiment'):
+                scores = analyze_headlines([keyed[h]['title'] for h in new])
+            db.executemany("INSERT INTO headlines VALUES (?, ?, ?, ?, ?, ?)", [
+                (h, keyed[h]['title'], keyed[h]['publisher'], keyed[h]['published'].timestamp(), score, label)
+                for h, (score, label) in zip(new, scores)])
+            db.executemany("INSERT OR IGNORE INTO links VALUES (?, ?)", [(h, ticker) for h in hashes])
+            db.execute("INSERT OR REPLACE INTO fetches VALUES (?, ?)", (ticker, time.time()))
+        return len(new)
+
+    def latest(self, ticker, limit=10):
+        with self.connect() as db:
+            rows = db.execute(
+                "SELECT h.title, h.publisher, h.published, h.score, h.label FROM headlines h "
+                "JOIN links l ON l.hash = h.hash WHERE l.ticker = ? ORDER BY h.published DESC, h.hash LIMIT ?",
+                (ticker, limit)).fetchall()
+        return [{'title': title, 'publisher': publisher, 'published': datetime.fromtimestamp(published),
+                 'sentiment_score': score, 'sentiment_label': label}
+                for title, publisher, published, score, label in rows]
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_news_store():
+    # İlk kullanımda oluşturulur (içe aktarma dosya açmaz)
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = NewsStore(os.path.join(DATA_DIR, "news.sqlite"))
+        return _store
+
+@ttl_cache(NEWS_TTL)
+def fetch_news(ticker):
+    # Paylaşılan önbellekle aynı hissenin haberlerini replikalardan yalnızca biri çeker
+    return get_provider().news(ticker)
+
+def get_stock_news(ticker, limit=10):
+    # Depo taze değilse haberler çekilir; okuma her zaman depodan, puanlarıyla birlikte
+    store = get_news_store()
+    if store.is_fresh(ticker, NEWS_TTL):
+        METRICS.count('cache_hits', 'news_store')
+    else:
+        METRICS.count('cache_misses', 'news_store')
+        METRICS.attempt('news', ticker)
+        try:
+            with METRICS.timer('news'):
+                news = fetch_news(ticker)
+            store.ingest(ticker, [parse_news_item(item) for item in news[:limit]])
+            METRICS.success('news', ticker)
+        except Exception as e:
+            METRICS.failure('news', ticker, e)
+    return store.latest(ticker, limit)
+
+def news_weight(hours):
+    # Haber yaşına göre ağırlık: 24 saatten yeni 2, 72 saatten yeni 1, daha eskisi sayılmaz
+    return 2 if hours < 24 else (1 if hours < 72 else 0)
+
+MEMBERS = set(BIST_50)
+
+def market_verdict(avg):
+    if avg >= 15:
+        return "POZİTİF", "#00FF00", "Piyasa iyimser"
+    elif avg <= -15:
+        return "NEGATİF", "#FF0000", "Piyasa kötümser"
+    return "NÖTR", "#FFFF00", "Piyasa dengeli"
+
+class SentimentAggregator:
+    # Taramanın zaten çektiği hisse haberlerinden piyasa ve sektör sentiment'i (ek istek yok).
+    # Ağırlık = haber yaşı (news_weight) x endeks üyeliği. Aynı başlık birden çok hisseye bağlıysa
+    # piyasada bir kez, her sektörde bir kez sayılır. Hisseler bittikçe add() ile güncellenir.
+    def __init__(self, now=None):
+        self.now = now or provider_now()
+        self.headlines = {}  # başlık hash'i -> [puan, yaş ağırlığı, üyelik ağırlığı, sektörler]
+        self.sector_tickers = {}
+
+    def add(self, ticker, news_list):
+        sector = SECTORS.get(ticker, "Diğer")
+        member = MARKET_MEMBER_WEIGHT if ticker in MEMBERS else MARKET_OTHER_WEIGHT
+        self.sector_tickers.setdefault(sector, set()).add(ticker)
+        for item in news_list:
+            age = news_weight((self.now - item['published']).total_seconds() / 3600)
+            if not age:
+                continue
+            key = headline_hash(item['title'], item['published'])
+            entry = self.headlines.setdefault(key, [item['sentiment_score'], age, 0, set()])
+            entry[2] = max(entry[2], member)
+            entry[3].add(sector)
+
+    def _average(self, entries):
+        weight = sum(age * member for _, age, member, _ in entries)
+        return sum(score * age * member for score, age, member, _ in entries) / weight if weight else 0
+
+    def market(self):
+        return market_verdict(self._average(list(self.headlines.values())))
+
+    def sectors(self):
+        # Sektör başına ortalama, en iyimserden en kötümsere
+        rows = []
+        for sector, tickers in self.sector_tickers.items():
+            entries = [e for e in self.headlines.values() if sector in e[3]]
+            avg = self._average(entries)
+            rows.append({'sector': sector, 'tickers': len(tickers), 'headlines': len(entries),
+                         'score': avg, 'label': market_verdict(avg)[0]})
+        return sorted(rows, key=lambda row: -row['score'])
+
+def stored_sentiment(tickers=BIST_50, limit=10):
+    # Haber deposundaki son haberlerden toplanır; ağa gidilmez
+    aggregator = SentimentAggregator()
+    store = get_news_store()
+    for ticker in tickers:
+        aggregator.add(ticker, store.latest(ticker, limit))
+    return aggregator
+
+def get_market_sentiment(aggregator=None):
+    # Önce taranmış hisselerin haberleri; depoda son 72 saatte haber yoksa ^XU100 başlıkları
+    if aggregator is None:
+        aggregator = stored_sentiment()
+    if aggregator.headlines:
+        return aggregator.market()
+    # get_stock_news hatayı kendisi yakalar ve boş liste döner: başlık yoksa veri yok demektir
+    news = get_stock_news("^XU100", limit=5)
+    if not news:
+        return "NÖTR", "#FFFF00", "Veri yok"
+    return market_verdict(sum(n['sentiment_score'] for n in news) / len(news))
@@ -0,0 +1,23 @@
+# Tüm dış veri (bar, temel veri, haber) tek bir sağlayıcı nesnesinden geçer.
+# Varsayılan YahooProvider; benchmark ve testlerde set_provider ile değiştirilir.
+# Sağlayıcı arayüzü: download(tickers, interval, **span) -> yf.download biçiminde tablo,
+# info(ticker) -> dict, news(ticker) -> list, now() -> datetime (haberlerin yaşı bu ana göre
+# hesaplanır; kayıttan oynatmada kaydın zamanı döner).
+
+_provider = None
+
+def get_provider():
+    global _provider
+    if _provider is None:
+        from .yahoo import YahooProvider
+        _provider = YahooProvider()
+    return _provider
+
+def set_provider(provider):
+    # Önceki sağlayıcıyı döner; geri yüklemek için tekrar set_provider'a verilebilir
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
+
+def provider_now():
+    return get_provider().now()
@@ -0,0 +1,120 @@
+import io
+import json
+import threading
+import zipfile
+from datetime import datetime
+
+import pandas as pd
+
+from .bars import PRICE_COLUMNS, empty_panel, stack_download
+
+# Kayıt / tekrar oynatma: bir tarama sırasında sağlayıcıdan gelen tüm yanıtlar (barlar,
+# temel veriler, haberler, hatalar ve o anki zaman) tek bir zip arşivine yazılır;
+# ReplayProvider aynı taramayı ağsız ve beklemesiz yeniden üretir.
+#   manifest.json           sürüm, kayıt zamanı, hisseler, sayılar
+#   bars/<interval>.parquet (Ticker, Date) indeksli barlar
+#   info.json, news.json    {ticker: yanıt}
+#   errors.json             {"info"|"news": {ticker: hata}}
+
+ARCHIVE_VERSION = 1
+
+class RecordingProvider:
+    # Başka bir sağlayıcıyı sarar; yanıtları olduğu gibi döndürür ve biriktirir
+    def __init__(self, inner):
+        self.inner = inner
+        self.lock = threading.Lock()
+        self.started = inner.now()
+        self.bars = {}
+        self.info_items = {}
+        self.news_items = {}
+        self.errors = {'info': {}, 'news': {}}
+
+    def now(self):
+        return self.started
+
+    def download(self, tickers, interval="1d", **span):
+        raw = self.inner.download(tickers, interval=interval, **span)
+        long = stack_download(raw.copy() if raw is not None else raw, tickers)
+        with self.lock:
+            self.bars.setdefault(interval, []).append(long)
+        return raw
+
+    def _record(self, kind, store, ticker, fetch):
+        try:
+            value = fetch(ticker)
+        except Exception as e:
+            with self.lock:
+                self.errors[kind][ticker] = f"{type(e).__name__}: {e}"
+            raise
+        with self.lock:
+            store[ticker] = value
+        return value
+
+    def info(self, ticker):
+        return self._record('info', self.info_items, ticker, self.inner.info)
+
+    def news(self, ticker):
+        return self._record('news', self.news_items, ticker, self.inner.news)
+
+    def save(self, path, tickers=()):
+        with self.lock:
+            bars = {interval: pd.concat(frames) for interval, frames in self.bars.items()}
+            manifest = {
+                'version': ARCHIVE_VERSION, 'recorded_at': self.started.isoformat(),
+                'tickers': list(tickers), 'info': len(self.info_items), 'news': len(self.news_items),
+                'bars': {interval: int(len(frame)) for interval, frame in bars.items()},
+            }
+            documents = {'manifest.json': manifest, 'info.json': self.info_items,
+                         'news.json': self.news_items, 'errors.json': self.errors}
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, document in documents.items():
+                archive.writestr(name, json.dumps(document, ensure_ascii=False, default=str))
+            for interval, frame in bars.items():
+                # Son indirme kazanır (seans içi güncellenen son bar)
+                frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+                buffer = io.BytesIO()
+                frame.to_parquet(buffer, compression='zstd')
+                archive.writestr(f"bars/{interval}.parquet", buffer.getvalue(), compress_type=zipfile.ZIP_STORED)
+        return manifest
+
+class ReplayProvider:
+    # Kayıttaki yanıtları döner; kayıtta olmayan istek hata verir (ağa gidilmez)
+    def __init__(self, path):
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+            self.manifest, self.info_items, self.news_items, self.errors = (
+                json.loads(archive.read(name)) for name in ('manifest.json', 'info.json', 'news.json', 'errors.json'))
+            self.bars = {name[len("bars/"):-len(".parquet")]: pd.read_parquet(io.BytesIO(archive.read(name)))
+                         for name in names if name.startswith("bars/")}
+        if self.manifest.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"desteklenmeyen arşiv sürümü: {self.manifest.get('version')}")
+        self.recorded_at = datetime.fromisoformat(self.manifest['recorded_at'])
+
+    def now(self):
+        return self.recorded_at
+
+    def download(self, tickers, interval="1d", **span):
+        panel = self.bars.get(interval, empty_panel())
+        known = set(panel.index.get_level_values('Ticker'))
+        frames = {}
+        for ticker in tickers:
+            if ticker not in known:
+                continue
+            data = panel.xs(ticker, level='Ticker')[PRICE_COLUMNS]
+            if span.get('start'):
+                data = data[data.index >= pd.Timestamp(span['start'])]
+            frames[ticker] = data
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+    def _replay(self, kind, store, ticker):
+        if ticker in store:
+            return store[ticker]
+        raise LookupError(self.errors[kind].get(ticker) or f"kayıtta yok: {kind} {ticker}")
+
+    def info(self, ticker):
+        return self._replay('info', self.info_items, ticker)
+
+    def news(self, ticker):
+        return self._replay('news', self.news_items, ticker)
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .bars import load_price_panel
+from .config import PREFILTER_MIN_TICKERS, SCAN_WORKERS
+from .indicators import calculate_panel_indicators
+from .metrics import METRICS
+from .scoring import analyze_with_news
+from .screen import screen_candidates
+
+def scan_universe(tickers, panel=None, indicators=None, max_workers=SCAN_WORKERS):
+    # Hisseleri thread havuzunda analiz eder; sonuçları bitiş sırasıyla verir
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(analyze_with_news, t, panel, indicators): t for t in tickers}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+def run_scan(tickers, on_result=None, max_workers=SCAN_WORKERS, prefilter=None):
+    # Tam hat: fiyat paneli -> göstergeler -> (büyük evrende ön eleme) -> paralel hisse analizi.
+    # on_result elenen hisseler için de (sonuç None) çağrılır; ilerleme tüm evren üzerindendir.
+    # Ölçümleri çağıran yazar (METRICS.write): sonrasındaki aşamalar (çizim, snapshot) da girsin.
+    METRICS.reset()
+    with METRICS.timer('price_panel'):
+        panel = load_price_panel(tickers)
+    with METRICS.timer('indicators'):
+        indicators = calculate_panel_indicators(panel) if len(panel) else None
+    if prefilter is None:
+        prefilter = len(tickers) > PREFILTER_MIN_TICKERS
+    candidates = list(tickers)
+    if prefilter and indicators is not None:
+        candidates = screen_candidates(tickers, indicators, max_workers)
+    keep = set(candidates)
+    done = 0
+    for ticker in tickers:
+        if ticker not in keep:
+            if on_result:
+                on_result(done, ticker, None)
+            done += 1
+    results = []
+    for ticker, result in scan_universe(candidates, panel, indicators, max_workers):
+        if result and result['categories']:
+            results.append(result)
+        if on_result:
+            on_result(done, ticker, result)
+        done += 1
+    # Bitiş sırası değil evren sırası: eşit kalitedeki sinyallerin sırası tekrarlanabilir olur
+    order = {t: i for i, t in enumerate(tickers)}
+    results.sort(key=lambda r: order[r['ticker']])
+    return results
@@ -0,0 +1,258 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from .bars import get_price_history
+from .fundamentals import get_fundamental_data
+from .indicators import calculate_indicators
+from .metrics import METRICS
+from .news import get_stock_news, news_weight
+from .provider import provider_now
+
+# --- KURALLAR ---
+# Aşağıdaki fonksiyonlar hem tek hisse skalerleriyle hem (tarih x hisse) dizileriyle
+# çalışır; canlı tarama ve backtest aynı kuralları kullanır.
+HIGH_CONFIDENCE = {'GÜN İÇİ': 6, '1 HAFTALIK': 7, '1 AYLIK': 9}
+HORIZONS = {'GÜN İÇİ': 1, '1 HAFTALIK': 5, '1 AYLIK': 21}  # backtest ufku (işlem günü)
+
+def technical_scores(tech):
+    price, rsi = tech['current_price'], tech['rsi']
+    day = (np.where(rsi < 35, 3, np.where(rsi > 65, -3, 0))
+           + np.where(tech['macd'] > tech['signal'], 2, -2)
+           + np.where(tech['volume_ratio'] > 1.5, 2, 0))
+    ema_9, ema_21 = tech['ema_9'], tech['ema_21']
+    week = (np.where((price > ema_9) & (ema_9 > ema_21), 3,
+                     np.where((price < ema_9) & (ema_9 < ema_21), -3, 0))
+            + np.where(price > tech['ema_50'], 2, 0))
+    return day, week
+
+FUNDAMENTAL_MAX = 8  # fundamental_score üst sınırı (3 + 3 + 2); alt sınır 0
+
+def fundamental_score(fund):
+    # Bilinmeyen (None) alan NaN olur ve hiçbir koşulu sağlamaz
+    pb, roe, margin = (np.asarray(fund[f], dtype=float) for f in ('price_to_book', 'roe', 'profit_margin'))
+    return (np.where((0 < pb) & (pb < 2), 3, 0)
+            + np.where(roe > 15, 3, 0)
+            + np.where(margin > 10, 2, 0))
+
+def signal_masks(day_score, week_score, month_score, rsi):
+    day_buy = (day_score >= 4) & (rsi < 45)
+    return {
+        ('GÜN İÇİ', 'AL'): day_buy,
+        ('GÜN İÇİ', 'SAT'): np.logical_not(day_buy) & (day_score <= -4) & (rsi > 55),
+        ('1 HAFTALIK', 'AL'): week_score >= 5,
+        ('1 HAFTALIK', 'SAT'): week_score <= -5,
+        ('1 AYLIK', 'AL'): month_score >= 6,
+        ('1 AYLIK', 'SAT'): month_score <= -6,
+    }
+
+def category_targets(price, atr):
+    return {
+        ('GÜN İÇİ', 'AL'): price + (atr * 1.5),
+        ('GÜN İÇİ', 'SAT'): price - (atr * 1.2),
+        ('1 HAFTALIK', 'AL'): price * 1.05,
+        ('1 HAFTALIK', 'SAT'): price * 0.97,
+        ('1 AYLIK', 'AL'): price * 1.10,
+        ('1 AYLIK', 'SAT'): price * 0.92,
+    }
+
+# Kalite puanı: kategori puanı basamakları (30/25/20) ve TOP/ELITE işaretlenen kategoriler
+QUALITY_STEPS = {'GÜN İÇİ': (8, 6, 4), '1 HAFTALIK': (8, 6, 5), '1 AYLIK': (10, 8, 6)}
+SCORE_FIELDS = {'GÜN İÇİ': 'day_score', '1 HAFTALIK': 'week_score', '1 AYLIK': 'month_score'}
+RANKED = ('GÜN İÇİ', '1 HAFTALIK')
+
+def calculate_quality_score(result, cat_type):
+    # Tek sonuç için skaler sürüm; tablo üzerinde quality_scores kullanılır
+    score = 0
+    if cat_type in QUALITY_STEPS:
+        s = result.get(SCORE_FIELDS[cat_type], 0)
+        high, mid, low = QUALITY_STEPS[cat_type]
+        score += 30 if s >= high else (25 if s >= mid else (20 if s >= low else 0))
+    
+    if result['news_sentiment'] == 'POZİTİF':
+        score += 25
+    elif result['news_sentiment'] == 'NÖTR':
+        score += 10
+    
+    if result['positive_news'] >= 3:
+        score += 15
+    elif result['positive_news'] >= 1:
+        score += 10
+    
+    tech = result.get('technical', {})
+    if tech.get('rsi', 50) < 40:
+        score += 10
+    if tech.get('volume_ratio', 1) > 1.5:
+        score += 10
+    
+    fund = result.get('fundamental', {})
+    roe, pb = fund.get('roe'), fund.get('price_to_book')
+    if roe is not None and roe > 20:
+        score += 5
+    if pb is not None and 0 < pb < 2:
+        score += 5
+    
+    return score
+
+def input_hash(technical, fundamental, news_list, weights):
+    # Puanlamanın tüm girdileri: barlardan gelen göstergeler, temel veriler, haberler ve yaş ağırlıkları
+    payload = [technical, fundamental, [(n['title'], n['sentiment_score'], w) for n, w in zip(news_list, weights)]]
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+def scan_input_hash(tickers, results):
+    # Taramanın tamamı için: evren + sinyal üreten hisselerin girdi hash'leri
+    payload = [list(tickers), sorted((r['ticker'], r['input_hash']) for r in results if r)]
+    return hashlib.sha1(json.dumps(payload).encode('utf-8')).hexdigest()[:16]
+
+def news_summary(news_list, now):
+    # Yaş ağırlıklı haber puanı (haber başına ortalama) ve son 72 saatteki pozitif/negatif sayısı
+    weights = [news_weight((now - item['published']).total_seconds() / 3600) for item in news_list]
+    news_score = 0
+    pos_count = neg_count = 0
+    for item, weight in zip(news_list, weights):
+        if weight:
+            news_score += item['sentiment_score'] * weight
+            if item['sentiment_label'] == 'POZİTİF':
+                pos_count += 1
+            elif item['sentiment_label'] == 'NEGATİF':
+                neg_count += 1
+    if news_list:
+        news_score /= len(news_list)
+    return weights, news_score, pos_count, neg_count
+
+# Girdileri değişmeyen hisse yeniden puanlanmaz: hisse -> (girdi hash'i, sonuç)
+_SCORED = {}
+
+def analyze_with_news(ticker, panel=None, indicators=None, technical=None):
+    # technical verilirse göstergeler hesaplanmaz (gün içi modda IndicatorState'ten gelir)
+    with METRICS.timer('analyze', ticker):
+        return _analyze_with_news(ticker, panel, indicators, technical)
+
+analyze_with_news.clear = _SCORED.clear  # ttl_cache'li fonksiyonlar gibi (ölçümde soğuk puanlama)
+
+def _analyze_with_news(ticker, panel, indicators, technical):
+    try:
+        if technical is not None:
+            pass
+        elif indicators is not None and ticker in indicators:
+            if indicators.bars[indicators.column[ticker]] < 30:
+                return None
+            technical = indicators.snapshot(ticker)
+        else:
+            data = get_price_history(ticker, panel)
+            if len(data) < 30:
+                return None
+            with METRICS.timer('indicators'):
+                technical = calculate_indicators(data)
+        
+        fundamental = get_fundamental_data(ticker)
+        news_list = get_stock_news(ticker, limit=10)
+        
+        weights, news_score, pos_count, neg_count = news_summary(news_list, provider_now())
+        digest = input_hash(technical, fundamental, news_list, weights)
+        hit = _SCORED.get(ticker)
+        if hit is not None and hit[0] == digest:
+            METRICS.count('skipped', 'rescoring')
+            return hit[1]
+        
+        news_label = 'POZİTİF' if news_score >= 15 else ('NEGATİF' if news_score <= -15 else 'NÖTR')
+        
+        price = technical['current_price']
+        atr = technical['atr']
+        
+        day_tech, week_tech = technical_scores(technical)
+        news_impact = news_score / 10
+        day_score = float(day_tech) + news_impact * 0.5
+        week_score = float(week_tech) + news_impact * 0.7
+        month_score = float(fundamental_score(fundamental)) + news_impact
+        
+        scores = {'GÜN İÇİ': day_score, '1 HAFTALIK': week_score, '1 AYLIK': month_score}
+        targets = category_targets(price, atr)
+        categories = []
+        
+        for (cat_type, action), hit in signal_masks(day_score, week_score, month_score, technical['rsi']).items():
+            if not hit:
+                continue
+            score = scores[cat_type]
+            target = targets[cat_type, action]
+            categories.append({
+                'type': cat_type, 'action': action,
+                'target': target,
+                'change': ((target - price) / price * 100),
+                'confidence': 'YÜKSEK' if abs(score) >= HIGH_CONFIDENCE[cat_type] else 'ORTA',
+                'score': score
+            })
+        
+        result = {
+            'ticker': ticker, 'price': price, 'categories': categories,
+            'news_sentiment': news_label, 'news_score': news_score,
+            'positive_news': pos_count, 'negative_news': neg_count,
+            'recent_news': news_list[:5], 'fundamental': fundamental,
+            'technical': technical, 'day_score': day_score,
+            'week_score': week_score, 'month_score': month_score,
+            'headlines': news_list, 'input_hash': digest
+        }
+        _SCORED[ticker] = (digest, result)
+        return result
+    except Exception as e:
+        METRICS.failure('analyze', ticker, e)
+        return None
+
+# --- SONUÇ TABLOSU ---
+# Tarama çıktısı tek tablo: hisse x kategori başına bir satır. Teknik ve temel alanlar
+# technical_* / fundamental_* sütunlarıdır; puanlama, sıralama ve ayırma sütun işlemleridir.
+TABLE_COLUMNS = ['ticker', 'price', 'type', 'action', 'target', 'change', 'confidence', 'score',
+                 'news_sentiment', 'news_score', 'positive_news', 'negative_news',
+                 'day_score', 'week_score', 'month_score', 'quality_score', 'is_top', 'is_elite']
+
+NESTED_FIELDS = ('categories', 'recent_news', 'headlines', 'technical', 'fundamental')
+
+def _column(table, name, default):
+    # Bilinmeyen (None) değerler NaN olur ve hiçbir koşulu sağlamaz
+    return np.asarray(table[name] if name in table else default, dtype=float)
+
+def quality_scores(table):
+    # calculate_quality_score'un tablo sürümü
+    kind = table['type'].to_numpy()
+    s = np.select([kind == t for t in SCORE_FIELDS], [_column(table, f, 0) for f in SCORE_FIELDS.values()], 0)
+    high, mid, low = (np.select([kind == t for t in QUALITY_STEPS], [steps[i] for steps in QUALITY_STEPS.values()], np.inf)
+                      for i in range(3))
+    sentiment, positive = table['news_sentiment'].to_numpy(), table['positive_news'].to_numpy()
+    rsi, volume_ratio = _column(table, 'technical_rsi', 50), _column(table, 'technical_volume_ratio', 1)
+    roe, pb = _column(table, 'fundamental_roe', np.nan), _column(table, 'fundamental_price_to_book', np.nan)
+    return (np.select([s >= high, s >= mid, s >= low], [30, 25, 20], 0)
+            + np.select([sentiment == 'POZİTİF', sentiment == 'NÖTR'], [25, 10], 0)
+            + np.select([positive >= 3, positive >= 1], [15, 10], 0)
+            + np.where(rsi < 40, 10, 0) + np.where(volume_ratio > 1.5, 10, 0)
+            + np.where(roe > 20, 5, 0) + np.where((0 < pb) & (pb < 2), 5, 0))
+
+def results_table(results):
+    # analyze_with_news sonuçları -> puanlı, kalite sırasına dizili, TOP/ELITE işaretli tablo
+    results = [r for r in results if r and r['categories']]
+    if not results:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+    columns = {k: [r[k] for r in results] for k in results[0] if k not in NESTED_FIELDS}
+    for group in ('technical', 'fundamental'):
+        columns.update({f"{group}_{k}": [r[group].get(k) for r in results] for k in results[0][group]})
+    categories = [cat for r in results for cat in r['categories']]
+    rows = np.repeat(np.arange(len(results)), [len(r['categories']) for r in results])
+    table = pd.DataFrame({k: [cat[k] for cat in categories] for k in categories[0]})
+    table = table.join(pd.DataFrame(columns).iloc[rows].reset_index(drop=True))
+    table['quality_score'] = quality_scores(table)
+    
+    # Sırala ve işaretle: kategori içi sıra, eşit kalitede tarama sırası korunur
+    table = table.sort_values('quality_score', ascending=False, kind='stable').reset_index(drop=True)
+    rank = table.groupby('type', sort=False).cumcount()
+    ranked = table['type'].isin(RANKED)
+    table['is_top'] = ranked & (rank == 0) & (table['quality_score'] >= 80)
+    table['is_elite'] = ranked & (rank < 2) & (table['quality_score'] >= 70)
+    return table[TABLE_COLUMNS + [c for c in table.columns if c not in TABLE_COLUMNS]]
+
+def split_categories(table):
+    # (gün içi, haftalık, aylık) alt tabloları, her biri kalite sırasında
+    return tuple(table[table['type'] == t].reset_index(drop=True) for t in SCORE_FIELDS)
+
+def categorize_results(results):
+    return split_categories(results_table(results))
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .config import SCAN_WORKERS
+from .fundamentals import get_fundamental_data
+from .metrics import METRICS
+from .news import get_stock_news
+from .provider import provider_now
+from .scoring import FUNDAMENTAL_MAX, fundamental_score, news_summary, technical_scores
+
+# Kademeli tarama: temel veri + puanlama yalnızca bir kategoriye girebilecek hisselere
+# uygulanır. Eşikler analyze_with_news ile aynıdır ve haber etkisi tahmin edilmez, tam
+# hesaplanır: haberler yerel depodan/önbellekten gelir ve analyze_with_news aynısını okur.
+#   1. aşama: göstergeler (vektörel) + haber etkisi -> gün içi / haftalık adaylar
+#   2. aşama: kalanlardan yalnızca aylık eşiğe ulaşabilecekler için temel veri -> aylık adaylar
+
+MIN_BARS = 30
+
+def news_impacts(tickers, max_workers=SCAN_WORKERS):
+    # analyze_with_news'teki news_score / 10
+    now = provider_now()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        lists = pool.map(lambda t: get_stock_news(t, limit=10), tickers)
+        return {t: news_summary(news, now)[1] / 10 for t, news in zip(tickers, lists)}
+
+def technical_candidates(indicators, impacts):
+    latest = indicators.latest()
+    impact = np.array([impacts.get(t, 0.0) for t in indicators.tickers])
+    rsi = latest['rsi']
+    day, week = technical_scores(latest)
+    day = day + impact * 0.5
+    week = week + impact * 0.7
+    day_possible = ((day >= 4) & (rsi < 45)) | ((day <= -4) & (rsi > 55))
+    week_possible = (week >= 5) | (week <= -5)
+    return dict(zip(indicators.tickers, (day_possible | week_possible).tolist()))
+
+def month_reachable(impact):
+    # Temel puan 0..FUNDAMENTAL_MAX: bu haber etkisiyle aylık eşiğe (±6) ulaşılabilir mi?
+    return impact + FUNDAMENTAL_MAX >= 6 or impact <= -6
+
+def screen_candidates(tickers, indicators, max_workers=SCAN_WORKERS):
+    enough = dict(zip(indicators.tickers, (indicators.bars >= MIN_BARS).tolist()))
+    ready = [t for t in tickers if enough.get(t)]
+    impacts = news_impacts(ready, max_workers)
+    with METRICS.timer('prefilter'):
+        passed = technical_candidates(indicators, impacts)
+    rest = [t for t in ready if not passed.get(t)]
+    reachable = [t for t in rest if month_reachable(impacts[t])]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        fundamentals = dict(zip(reachable, pool.map(get_fundamental_data, reachable)))
+    monthly = {t for t, f in fundamentals.items() if abs(float(fundamental_score(f)) + impacts[t]) >= 6}
+    candidates = [t for t in tickers if passed.get(t) or t in monthly]
+    METRICS.count('screened_out', 'technical', len(tickers) - len(ready) + len(rest) - len(reachable))
+    METRICS.count('screened_out', 'fundamental', len(reachable) - len(monthly))
+    return candidates
@@ -0,0 +1,135 @@
+import re
+from functools import lru_cache
+
+from .config import ENGLISH_SUFFIXES, ENGLISH_WORDS, MARKET_IMPACT_WORDS, NEGATIVE_PHRASES, NEGATIVE_WORDS, \
+    POSITIVE_PHRASES, POSITIVE_WORDS, SENTIMENT_EXCEPTIONS, STEM_VARIANTS, SUFFIXES
+
+def turkish_lower(text):
+    text = text.replace('İ', 'i').replace('I', 'ı').lower()
+    return text.translate(str.maketrans('âîû', 'aiu'))
+
+def fold(text):
+    # Eşleştirme anahtarı: büyük harfli İngilizce/ASCII yazımda 'I' Türkçe kuralla 'ı' olur
+    # (PROFIT -> profıt, KRIZ -> krız), bu yüzden ı ve i aynı harf sayılır
+    return turkish_lower(text).replace('ı', 'i')
+
+class SentimentLexicon:
+    # Kelimeler bir trie'de tutulur: her token için en uzun kök aranır, kalan kısım
+    # kökün dilindeki geçerli bir ek zinciri ise eşleşir (kârı, zararını, düşüşle; profits).
+    # İfadeler önce denenir; istisna listesindeki kelimeler hiç eşleşmez.
+    def __init__(self, positive, negative, weights, positive_phrases=(), negative_phrases=(),
+                 variants=None, suffixes=SUFFIXES, english_words=(), english_suffixes=ENGLISH_SUFFIXES,
+                 exceptions=()):
+        self.trie = {}
+        variants = variants or {}
+        english_words = set(english_words)
+        self.exceptions = {fold(word) for word in exceptions}
+        for polarity, words in ((1, positive), (-1, negative)):
+            for word in words:
+                entry = (polarity, weights.get(word, 1))
+                for form in [word] + variants.get(word, []):
+                    self._insert(fold(form), (entry, word in english_words))
+        self.phrase_trie = {}
+        for polarity, phrases in ((1, positive_phrases), (-1, negative_phrases)):
+            for phrase in phrases:
+                words = tuple(fold(phrase).split())
+                node = self.phrase_trie
+                for ch in words[0]:
+                    node = node.setdefault(ch, {})
+                node.setdefault('', []).append((words[1:], polarity, weights.get(phrase, 1), phrase in english_words))
+        self.suffix_chains = {False: self._chain(suffixes), True: self._chain(english_suffixes)}
+
+    @staticmethod
+    def _chain(suffixes):
+        alternatives = '|'.join(sorted({re.escape(fold(s)) for s in suffixes}, key=len, reverse=True))
+        return re.compile(f'(?:{alternatives}){{0,3}}')
+
+    def _insert(self, word, entry):
+        node = self.trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = entry
+
+    def suffixed(self, token, end, english):
+        # token[:end] kök; kalanı kökün dilinde geçerli bir ek zinciri mi?
+        return end == len(token) or bool(self.suffix_chains[english].fullmatch(token, end))
+
+    def match(self, token):
+        if token in self.exceptions:
+            return None
+        node = self.trie
+        found = []
+        for i, ch in enumerate(token):
+            node = node.get(ch)
+            if node is None:
+                break
+            if '' in node:
+                found.append((i + 1, node['']))
+        for end, (entry, english) in reversed(found):
+            if self.suffixed(token, end, english):
+                return entry
+        return None
+
+    def match_phrase(self, tokens, i):
+        # İlk kelime match() gibi kök + ek zinciri olarak aranır (kar uyarısı ama karar uyarısı değil);
+        # sonraki kelimeler fiil çekimi alabildiği için (açıkladı, düşürdü) token'ın başında aranır
+        token = tokens[i]
+        if token in self.exceptions:
+            return None
+        node = self.phrase_trie
+        best = None
+        for end, ch in enumerate(token, 1):
+            node = node.get(ch)
+            if node is None:
+                break
+            for rest, polarity, weight, english in node.get('', ()):
+                if not self.suffixed(token, end, english):
+                    continue
+                n = len(rest)
+                if len(tokens) - i > n and all(t.startswith(w) for t, w in zip(tokens[i + 1:], rest)):
+                    if best is None or n + 1 > best[0]:
+                        best = (n + 1, (polarity, weight))
+        return best
+
+    def score(self, text):
+        if not text:
+            return 0, 'NÖTR'
+        tokens = re.findall(r'\w+', fold(text))
+        pos = neg = 0
+        score = 0
+        i = 0
+        while i < len(tokens):
+            hit = self.match_phrase(tokens, i)
+            if hit:
+                step, (polarity, weight) = hit
+            else:
+                step, entry = 1, self.match(tokens[i])
+                polarity, weight = entry or (0, 0)
+            if polarity > 0:
+                pos += 1
+                score += weight
+            elif polarity < 0:
+                neg += 1
+                score -= weight
+            i += step
+        total = pos + neg
+        if total == 0:
+            return 0, 'NÖTR'
+        score = max(-100, min(100, (score / total) * 50))
+        if score >= 20:
+            return score, 'POZİTİF'
+        elif score <= -20:
+            return score, 'NEGATİF'
+        return score, 'NÖTR'
+
+LEXICON = SentimentLexicon(POSITIVE_WORDS, NEGATIVE_WORDS, MARKET_IMPACT_WORDS,
+                           POSITIVE_PHRASES, NEGATIVE_PHRASES, STEM_VARIANTS,
+                           english_words=ENGLISH_WORDS, exceptions=SENTIMENT_EXCEPTIONS)
+
+@lru_cache(maxsize=8192)
+def analyze_sentiment(text):
+    return LEXICON.score(text)
+
+def analyze_headlines(titles):
+    # Toplu puanlama; aynı başlık (farklı hisselerde de olsa) bir kez puanlanır
+    return [analyze_sentiment(t) for t in titles]
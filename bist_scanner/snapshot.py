@@ -0,0 +1,83 @@
+import json
+import os
+from datetime import datetime
+
+from .config import DATA_DIR, SNAPSHOT_KEEP
+
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshots")
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, 'item'):  # numpy skaler
+        return value.item()
+    raise TypeError(f"JSON'a çevrilemiyor: {type(value)}")
+
+def table_records(table):
+    # NaN -> None: JSON'da null
+    return table.astype(object).where(table.notna(), None).to_dict('records')
+
+def snapshot_path(version):
+    return os.path.join(SNAPSHOT_DIR, f"snapshot-{version}.json")
+
+def save_snapshot(snapshot):
+    path = snapshot_path(snapshot['version'])
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, default=json_default)
+    os.replace(path + ".tmp", path)
+
+def write_snapshot(tickers, table, input_hash=None):
+    # Sürümlü tarama sonucu (results_table satırları); yazma atomik, eski snapshot'lar budanır.
+    # checked_at: sonuçların en son doğrulandığı an (girdileri aynı taramalar touch_snapshot ile ilerletir)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    created = datetime.now()
+    version = created.strftime('%Y%m%d-%H%M%S-%f')
+    snapshot = {
+        'version': version, 'created_at': created.isoformat(), 'checked_at': created.isoformat(),
+        'tickers': list(tickers), 'input_hash': input_hash, 'results': table_records(table)
+    }
+    save_snapshot(snapshot)
+    for old in list_snapshots()[:-SNAPSHOT_KEEP]:
+        os.remove(old)
+    return snapshot
+
+def touch_snapshot(snapshot):
+    # Sürüm ve sonuçlar aynı kalır, yalnızca son doğrulama zamanı güncellenir
+    snapshot = {**snapshot, 'checked_at': datetime.now().isoformat()}
+    save_snapshot(snapshot)
+    return snapshot
+
+def snapshot_mtime(version):
+    # touch_snapshot dosyayı yeniden yazar: aynı sürümün güncellendiğini okumadan anlamak için
+    try:
+        return os.stat(snapshot_path(version)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def list_snapshots():
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return []
+    names = sorted(n for n in os.listdir(SNAPSHOT_DIR) if n.startswith("snapshot-") and n.endswith(".json"))
+    return [os.path.join(SNAPSHOT_DIR, n) for n in names]
+
+def latest_version():
+    # Dosyayı okumadan en yeni snapshot'ın sürümü
+    paths = list_snapshots()
+    return os.path.basename(paths[-1])[len("snapshot-"):-len(".json")] if paths else None
+
+def load_latest_snapshot():
+    paths = list_snapshots()
+    if not paths:
+        return None
+    with open(paths[-1], encoding="utf-8") as f:
+        return json.load(f)
+
+def snapshot_table(snapshot):
+    # Eski biçimdeki (day/week/month listeleri) snapshot'lar da tabloya çevrilir
+    import pandas as pd
+    if 'results' in snapshot:
+        return pd.DataFrame(snapshot['results'])
+    table = pd.json_normalize(snapshot['day'] + snapshot['week'] + snapshot['month'], sep='_')
+    for flag in ('is_top', 'is_elite'):  # aylık satırlarda yoktu
+        table[flag] = table[flag].fillna(False).astype(bool) if flag in table else False
+    return table
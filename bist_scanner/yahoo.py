@@ -0,0 +1,223 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+from .config import (YAHOO_BACKOFF, YAHOO_BACKOFF_MAX, YAHOO_BREAKER_COOLDOWN, YAHOO_BREAKER_FAILURES,
+                     YAHOO_BURST, YAHOO_MAX_RPS, YAHOO_RETRIES, YAHOO_TIMEOUT)
+from .metrics import METRICS, log
+
+_yf = None
+
+def yf():
+    # yfinance (ve pandas/curl bağımlılıkları) ilk ağ çağrısında yüklenir
+    global _yf
+    if _yf is None:
+        import yfinance
+        _yf = yfinance
+    return _yf
+
+_session = None
+_session_lock = threading.Lock()
+
+def session():
+    # Tüm çağrılar tek curl_cffi oturumunu paylaşır: çerez/crumb bir kez alınır,
+    # bağlantılar thread başına açık tutulur (keep-alive)
+    global _session
+    with _session_lock:
+        if _session is None:
+            from curl_cffi import requests
+            _session = requests.Session(impersonate="chrome", timeout=YAHOO_TIMEOUT)
+        return _session
+
+class TokenBucket:
+    # Saniyede `rate` jeton dolan, en fazla `burst` jeton tutan kova; thread'ler arasında ortak.
+    # 429 alınınca pause() ile tüm istekler bir süre durdurulur.
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+YAHOO_LIMITER = TokenBucket(YAHOO_MAX_RPS, YAHOO_BURST)
+
+class CircuitOpen(Exception):
+    pass
+
+class EmptyDownload(Exception):
+    # yf.download hataları yutar; istenen hisselerin hiçbirine bar gelmemesi (çoğunlukla hız sınırı)
+    pass
+
+class CircuitBreaker:
+    # Art arda `failures` geçici hatada açılır; `cooldown` sn sonra tek bir deneme isteğine
+    # izin verir (yarı açık), o başarılı olursa kapanır
+    def __init__(self, failures=YAHOO_BREAKER_FAILURES, cooldown=YAHOO_BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.errors = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def before(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+                raise CircuitOpen(f"Yahoo devresi açık ({self.errors} ardışık hata)")
+            self.probing = True
+
+    def abort(self):
+        with self.lock:
+            self.probing = False
+
+    def record(self, ok):
+        with self.lock:
+            self.probing = False
+            if ok:
+                self.errors, self.opened_at = 0, None
+                return
+            self.errors += 1
+            if self.errors >= self.failures:
+                if self.opened_at is None:
+                    log.warning("Yahoo devresi açıldı: %d ardışık hata", self.errors)
+                self.opened_at = time.monotonic()
+
+class InFlight:
+    # Aynı anahtarla eşzamanlı gelen çağrılar tek isteğe indirgenir; hepsi aynı sonucu (ya da hatayı) alır
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def run(self, key, fn):
+        with self.lock:
+            future = self.calls.get(key)
+            owner = future is None
+            if owner:
+                future = self.calls[key] = Future()
+        if not owner:
+            METRICS.count('coalesced', key[0])
+            return future.result()
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                del self.calls[key]
+        return future.result()
+
+def status_code(error):
+    return getattr(getattr(error, 'response', None), 'status_code', None)
+
+def is_rate_limited(error):
+    return (type(error).__name__ == 'YFRateLimitError' or status_code(error) == 429
+            or isinstance(error, EmptyDownload))
+
+def is_transient(error):
+    if is_rate_limited(error) or status_code(error) in (500, 502, 503, 504):
+        return True
+    from curl_cffi.requests.exceptions import RequestException
+    return isinstance(error, RequestException) and not status_code(error)  # bağlantı/zaman aşımı: yanıt yok
+
+def downloaded_tickers(data, tickers):
+    # yf.download sonucunda en az bir kapanışı olan hisseler
+    if data is None or data.empty:
+        return set()
+    if data.columns.nlevels == 1:
+        return set(tickers) if data['Close'].notna().any() else set()
+    close = data.xs('Close', axis=1, level=1)
+    return {t for t in close.columns if close[t].notna().any()}
+
+def backoff(attempt):
+    # Tam jitter'lı üstel bekleme
+    return random.uniform(0, min(YAHOO_BACKOFF_MAX, YAHOO_BACKOFF * 2 ** attempt))
+
+class YahooProvider:
+    # Varsayılan veri sağlayıcı: yfinance; ortak oturum, jeton kovası, yeniden deneme,
+    # devre kesici ve eşzamanlı aynı çağrıların birleştirilmesi tek yerden
+    def __init__(self, limiter=YAHOO_LIMITER, breaker=None, retries=YAHOO_RETRIES):
+        self.limiter = limiter
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = retries
+        self.inflight = InFlight()
+
+    def call(self, name, key, fn):
+        return self.inflight.run((name, key), lambda: self._call(name, fn))
+
+    def _call(self, name, fn):
+        for attempt in range(self.retries + 1):
+            self.breaker.before()
+            try:
+                self.limiter.wait()
+                value = fn()
+            except Exception as e:
+                if not is_transient(e):
+                    self.breaker.record(True)  # 404 vb.: servis yanıt veriyor, devre açılmasın
+                    raise
+                self.breaker.record(False)
+                delay = backoff(attempt)
+                if is_rate_limited(e):
+                    METRICS.count('throttled', name)
+                    self.limiter.pause(delay)
+                if attempt == self.retries:
+                    raise
+                METRICS.count('retries', name)
+                log.info("%s yeniden deneniyor (%d/%d): %s", name, attempt + 1, self.retries, e)
+                time.sleep(delay)
+            except BaseException:
+                self.breaker.abort()  # deneme yarıda kesildi (Ctrl+C): sonraki çağrı yeniden dener
+                raise
+            else:
+                self.breaker.record(True)
+                return value
+
+    def download(self, tickers, interval="1d", **span):
+        tickers = list(tickers)
+
+        def fetch():
+            data = yf().download(tickers, interval=interval, group_by="ticker", auto_adjust=True,
+                                 threads=True, progress=False, timeout=YAHOO_TIMEOUT,
+                                 session=session(), **span)
+            # Hata yutulur, başarısız hisse boş (NaN) sütun olarak gelir: sonuca bakılır.
+            # Hiçbiri gelmediyse yeniden denenir; bir kısmı eksikse (kota, delist) sayılır ve
+            # bir sonraki güncellemede yeniden istenir.
+            received = downloaded_tickers(data, tickers)
+            if tickers and not received:
+                raise EmptyDownload(f"{len(tickers)} hisse için bar gelmedi")
+            if len(received) < len(tickers):
+                METRICS.count('missing', 'download', len(tickers) - len(received))
+            return data
+
+        return self.call('download', (tuple(tickers), interval, tuple(sorted(span.items()))), fetch)
+
+    def info(self, ticker):
+        return self.call('info', ticker, lambda: yf().Ticker(ticker, session=session()).info)
+
+    def now(self):
+        return datetime.now()
+
+    def news(self, ticker):
+        return self.call('news', ticker, lambda: yf().Ticker(ticker, session=session()).news or [])
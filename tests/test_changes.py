@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from bist_scanner import changes, snapshot
+from bist_scanner.changes import diff_tables, load_changes, publish_scan
+
+def row(ticker, type='1 HAFTALIK', action='AL', quality=50, top=False, elite=False):
+    return {'ticker': ticker, 'type': type, 'action': action, 'quality_score': quality,
+            'is_top': top, 'is_elite': elite}
+
+def events(previous, current):
+    table = diff_tables(pd.DataFrame(previous), pd.DataFrame(current))
+    return {(e['event'], e['ticker']): e for e in table.to_dict('records')}
+
+def test_diff_tables_events():
+    found = events(
+        [row('A.IS'), row('B.IS'), row('C.IS'), row('D.IS', elite=True), row('E.IS')],
+        [row('A.IS'), row('C.IS', action='SAT'), row('D.IS', quality=70, top=True), row('E.IS', quality=60),
+         row('F.IS')],
+    )
+    assert set(found) == {('removed', 'B.IS'), ('flipped', 'C.IS'), ('quality', 'D.IS'), ('promoted', 'D.IS'),
+                          ('quality', 'E.IS'), ('new', 'F.IS')}
+    assert found['flipped', 'C.IS']['action_before'] == 'AL' and found['flipped', 'C.IS']['action_after'] == 'SAT'
+    assert (found['promoted', 'D.IS']['badge_before'], found['promoted', 'D.IS']['badge_after']) == ('ELITE', 'TOP')
+    assert pd.isna(found['new', 'F.IS']['quality_before']) and found['new', 'F.IS']['quality_after'] == 50
+
+def test_diff_tables_keys_on_category():
+    # Aynı hisse farklı kategoride: biri kalkar, diğeri yeni
+    found = events([row('A.IS', type='GÜN İÇİ')], [row('A.IS', type='1 AYLIK')])
+    assert set(found) == {('removed', 'A.IS'), ('new', 'A.IS')}
+
+def test_diff_tables_demoted():
+    found = events([row('A.IS', top=True)], [row('A.IS')])
+    assert set(found) == {('demoted', 'A.IS')}
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Sonuçlar doğrudan tablo satırları; puanlama bu testin konusu değil
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(changes, 'results_table', lambda results: pd.DataFrame([r['row'] for r in results]))
+    return str(tmp_path / 'changes.jsonl')
+
+def result(ticker, digest='x', **kwargs):
+    return {'ticker': ticker, 'input_hash': digest, 'row': row(ticker, **kwargs)}
+
+def test_publish_scan(store):
+    tickers = ['A.IS', 'B.IS']
+    first, events = publish_scan(tickers, [result('A.IS')], store)
+    assert events == []  # ilk tarama: karşılaştırılacak snapshot yok
+    second, events = publish_scan(tickers, [result('A.IS', 'y', action='SAT'), result('B.IS')], store)
+    assert second['version'] > first['version']
+    assert sorted((e['event'], e['ticker']) for e in events) == [('flipped', 'A.IS'), ('new', 'B.IS')]
+    assert all(e['version'] == second['version'] and e['previous_version'] == first['version'] for e in events)
+    assert load_changes(second['version'], store) == events
+
+def test_publish_scan_unchanged_inputs(store):
+    tickers = ['A.IS']
+    first, _ = publish_scan(tickers, [result('A.IS')], store)
+    second, events = publish_scan(tickers, [result('A.IS')], store)
+    assert events is None
+    assert second['version'] == first['version'] and second['created_at'] == first['created_at']
+    assert second['checked_at'] > first['checked_at']
+    assert snapshot.load_latest_snapshot()['checked_at'] == second['checked_at']
+    assert len(snapshot.list_snapshots()) == 1
+    assert load_changes(path=store) == []
+
+def test_publish_scan_new_universe(store):
+    publish_scan(['A.IS'], [result('A.IS')], store)
+    _, events = publish_scan(['A.IS', 'B.IS'], [result('A.IS')], store)
+    assert events == []
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from bist_scanner.indicators import IndicatorState, calculate_indicators, calculate_panel_indicators
+
+def synthetic_bars(n=160, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    close[60:80] = close[59]  # 20 bar yatay fiyat: RSI kazanç/kayıp 0, Bollinger std 0
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    spread[60:80] = 0.0
+    volume = rng.integers(1_000, 50_000, n).astype(float)
+    volume[70] = 0.0
+    dates = pd.bdate_range("2024-01-01", periods=n, name='Date')
+    return pd.DataFrame({'Open': close, 'High': close + spread, 'Low': close - spread,
+                         'Close': close, 'Volume': volume}, index=dates)
+
+def assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        assert np.allclose(actual[key], expected[key], equal_nan=True), key
+
+def test_update_matches_batch_on_every_bar():
+    # İlk barlar pencereler dolmadan (NaN) da karşılaştırılır
+    data = synthetic_bars()
+    state = IndicatorState()
+    for i, (ts, bar) in enumerate(data.iterrows()):
+        assert_same(state.update(bar, ts), calculate_indicators(data.iloc[:i + 1]))
+
+def test_feed_only_processes_new_bars():
+    data = synthetic_bars()
+    state = IndicatorState.from_history(data.iloc[:100])
+    assert state.feed(data.iloc[:100]) == 0
+    assert state.feed(data) == len(data) - 100
+    assert_same(state.values, calculate_indicators(data))
+
+def test_peek_does_not_advance_state():
+    data = synthetic_bars()
+    state = IndicatorState.from_history(data.iloc[:-1])
+    before = dict(state.values)
+    assert_same(state.peek(data.iloc[-1], data.index[-1]), calculate_indicators(data))
+    assert_same(state.values, before)
+    assert state.last_timestamp == data.index[-2]
+
+def test_panel_matches_single_ticker_with_gaps():
+    # Eksik bar (işlem durdurma) ve kısa geçmiş (yeni halka arz) ortak takvimde NaN bırakmamalı
+    frames = {'AAA.IS': synthetic_bars(seed=1), 'BBB.IS': synthetic_bars(seed=2), 'CCC.IS': synthetic_bars(seed=3)}
+    frames['AAA.IS'] = frames['AAA.IS'].drop(frames['AAA.IS'].index[-5])
+    frames['BBB.IS'] = frames['BBB.IS'].iloc[90:]
+    frames['CCC.IS'] = frames['CCC.IS'].iloc[:-3]
+    panel = pd.concat(frames, names=['Ticker', 'Date'])
+    indicators = calculate_panel_indicators(panel)
+    for ticker, data in frames.items():
+        assert_same(indicators.snapshot(ticker), calculate_indicators(data))
+        assert not np.isnan(indicators.snapshot(ticker)['rsi'])
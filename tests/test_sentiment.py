@@ -0,0 +1,43 @@
+import pytest
+
+from bist_scanner.sentiment import analyze_sentiment
+
+@pytest.mark.parametrize("title", [
+    "Kara para soruşturması genişliyor",
+    "Kars'ta yeni fabrika açıldı",
+    "Karne dağıtıldı",
+])
+def test_short_root_false_friends_are_neutral(title):
+    assert analyze_sentiment(title) == (0, 'NÖTR')
+
+@pytest.mark.parametrize("title, label", [
+    ("Net karı yüzde 40 arttı", 'POZİTİF'),
+    ("Şirketin kârı rekor kırdı", 'POZİTİF'),
+    ("Zararını azalttı", 'NEGATİF'),
+    ("Kaybı büyüdü", 'NEGATİF'),
+    ("Record profits reported", 'POZİTİF'),
+    ("Losses widened", 'NEGATİF'),
+])
+def test_suffixed_roots_still_match(title, label):
+    assert analyze_sentiment(title)[1] == label
+
+def test_english_suffixes_only_on_english_roots():
+    # 'kar' + 's' Türkçe değil; 'loss' + 'es' İngilizce
+    assert analyze_sentiment("Kars") == (0, 'NÖTR')
+    assert analyze_sentiment("losses")[1] == 'NEGATİF'
+
+@pytest.mark.parametrize("title, label", [
+    ("PROFIT WARNING", 'NEGATİF'),
+    ("RISK ARTIYOR", 'NEGATİF'),
+    ("KRIZ", 'NEGATİF'),
+    ("KRİZ DERİNLEŞİYOR", 'NEGATİF'),
+    ("NET KARI ARTTI", 'POZİTİF'),
+])
+def test_uppercase_ascii_i_matches(title, label):
+    assert analyze_sentiment(title)[1] == label
+
+def test_phrase_first_word_needs_a_suffix_chain():
+    # 'karar' 'kar' ile başlar ama 'ar' bir ek zinciri değil: 'kar uyarısı' eşleşmemeli
+    assert analyze_sentiment("Karar uyarısı verildi") == (0, 'NÖTR')
+    assert analyze_sentiment("Kâr uyarısı geldi")[0] == -100
+    assert analyze_sentiment("Profits warning issued")[1] == 'NEGATİF'
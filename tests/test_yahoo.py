@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bist_scanner import yahoo
+from bist_scanner.yahoo import CircuitBreaker, CircuitOpen, EmptyDownload, TokenBucket, YahooProvider
+
+def frame(received, missing=()):
+    # yf.download(group_by="ticker") biçimi: başarısız hisse tümü NaN sütunlarla gelir
+    index = pd.date_range("2026-01-01", periods=3, freq="D")
+    columns = pd.MultiIndex.from_product([list(received) + list(missing), ['Open', 'High', 'Low', 'Close', 'Volume']])
+    data = pd.DataFrame(1.0, index=index, columns=columns)
+    for ticker in missing:
+        data[ticker] = np.nan
+    return data
+
+class FakeYF:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def download(self, tickers, **kwargs):
+        self.calls += 1
+        return self.results.pop(0)
+
+@pytest.fixture
+def provider(monkeypatch):
+    monkeypatch.setattr(yahoo, 'backoff', lambda attempt: 0)
+    return YahooProvider(limiter=TokenBucket(0), breaker=CircuitBreaker(failures=3, cooldown=0.1), retries=2)
+
+def test_empty_download_is_retried(provider, monkeypatch):
+    fake = FakeYF(pd.DataFrame(), frame([], ['A.IS', 'B.IS']), frame(['A.IS', 'B.IS']))
+    monkeypatch.setattr(yahoo, '_yf', fake)
+    data = provider.download(['A.IS', 'B.IS'])
+    assert fake.calls == 3
+    assert not data.empty
+    assert provider.breaker.errors == 0
+
+def test_empty_download_counts_towards_breaker(provider, monkeypatch):
+    monkeypatch.setattr(yahoo, '_yf', FakeYF(*[pd.DataFrame()] * 3))
+    with pytest.raises(EmptyDownload):
+        provider.download(['A.IS'])
+    assert provider.breaker.opened_at is not None
+
+def test_partial_download_is_not_a_failure(provider, monkeypatch):
+    fake = FakeYF(frame(['A.IS'], ['B.IS']))
+    monkeypatch.setattr(yahoo, '_yf', fake)
+    data = provider.download(['A.IS', 'B.IS'])
+    assert fake.calls == 1
+    assert yahoo.downloaded_tickers(data, ['A.IS', 'B.IS']) == {'A.IS'}
+
+def test_breaker_closes_after_non_transient_probe(provider):
+    # Yarı açıkta 404/KeyError gibi kalıcı hata: servis yanıt veriyor, devre kapanmalı
+    def throttled():
+        raise EmptyDownload()
+
+    with pytest.raises(EmptyDownload):
+        provider.call('download', 'x', throttled)
+    assert provider.breaker.opened_at is not None
+    with pytest.raises(CircuitOpen):
+        provider.call('info', 'y', lambda: 1)
+
+    time.sleep(provider.breaker.cooldown)
+
+    def missing():
+        raise KeyError('regularMarketPrice')
+
+    with pytest.raises(KeyError):
+        provider.call('info', 'y', missing)
+    assert provider.call('info', 'y', lambda: 1) == 1
+    assert provider.breaker.opened_at is None